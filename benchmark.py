@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""
+Script to benchmark the load, search, train and predict hot paths (headless)
+Writes p50/p95 latency, throughput and peak memory to a JSON file and reports
+regressions against a previous run
+"""
+import argparse
+import sys
+import os
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from src.benchmark import run_benchmarks, compare, save_results, load_results
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Football AI benchmarks")
+    parser.add_argument("--sizes", default=None,
+                        help="Comma-separated sizes: player table rows for search/batch cases, "
+                             "generated Season CSV rows for load/train cases (default: shipped data)")
+    parser.add_argument("--repeat", type=int, default=20, help="Timed runs per case (default: 20)")
+    parser.add_argument("--skip-training", action="store_true", help="Don't time prepare_data/train_models")
+    parser.add_argument("--output", default="benchmark_results.json", help="Where to write the results")
+    parser.add_argument("--baseline", default=None, help="Previous results to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="Relative p50 slowdown reported as a regression (default: 0.2)")
+    args = parser.parse_args()
+
+    sizes = [int(n) for n in args.sizes.split(",")] if args.sizes else None
+    results = run_benchmarks(sizes, repeat=args.repeat, include_training=not args.skip_training)
+    save_results(results, args.output)
+    print(f"Results saved to {args.output}")
+
+    if args.baseline:
+        regressions = compare(results, load_results(args.baseline), args.threshold)
+        if regressions:
+            print(f"{len(regressions)} regression(s) against {args.baseline}:")
+            for name, before, after, change in regressions:
+                print(f"  {name}: p50 {before:.3f} ms -> {after:.3f} ms (+{change:.0%})")
+            sys.exit(1)
+        print(f"No regressions against {args.baseline}")
@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""
+Script to generate synthetic player-season data with the Season.csv schema
+Streams any number of rows to CSV (or Parquet with pyarrow) for scale testing
+"""
+import argparse
+import sys
+import os
+import time
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from src.synthetic import write_csv, write_parquet
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate synthetic Season.csv-schema data")
+    parser.add_argument("--rows", type=int, default=100_000, help="Number of player-season rows (default: 100000)")
+    parser.add_argument("--output", default="data/synthetic_season.csv", help="Output file")
+    parser.add_argument("--format", choices=["csv", "parquet"], default=None,
+                        help="Output format (default: from the output file extension)")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed (default: 0)")
+    parser.add_argument("--first-id", type=int, default=None,
+                        help="PlayerID of the first generated player (default: above the real IDs)")
+    parser.add_argument("--chunk-size", type=int, default=50_000, help="Rows generated per chunk (default: 50000)")
+    parser.add_argument("--missing-rate", type=float, default=0.01,
+                        help="Share of stat/club cells left empty (default: 0.01)")
+    args = parser.parse_args()
+
+    fmt = args.format or ("parquet" if args.output.endswith(".parquet") else "csv")
+    writer = write_parquet if fmt == "parquet" else write_csv
+
+    start = time.perf_counter()
+    try:
+        rows = writer(args.output, args.rows, seed=args.seed, chunk_size=args.chunk_size,
+                      missing_rate=args.missing_rate, first_id=args.first_id)
+    except ImportError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    print(f"Wrote {rows} rows to {args.output} in {time.perf_counter() - start:.1f}s")
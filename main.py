@@ -1,18 +1,16 @@
 # main.py
 # Football AI Prediction System - Main GUI
 import customtkinter as ctk  # type: ignore
-import threading
-import time
 import sys
 import os
 
 # Add src to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
-from src.data_loader import load_and_combine
-from src.search import smart_search
-from src.status_check import is_active
-from src.predictor import predict_player_value, predict_performance, predict_from_input
+# Only light modules here; pandas, the models and the data are loaded by
+# src.startup in the background (see App.__init__), the rest is imported on use
+from src.startup import prewarm
+from src.task_manager import TaskManager
 
 # Football theme colors
 FIELD_DARK_GREEN = "#1a4d2e"      # Dark green field background
@@ -23,6 +21,10 @@ GOLD = "#ffd700"                  # Gold for highlights
 DARK_GRAY = "#1e1e1e"             # Dark gray for contrast
 RED = "#dc2626"                   # Red for errors/important
 
+# Search-as-you-type
+SUGGEST_LIMIT = 8
+SUGGEST_DEBOUNCE_MS = 120
+
 ctk.set_appearance_mode("dark")
 ctk.set_default_color_theme("blue")
 
@@ -38,9 +40,14 @@ class App(ctk.CTk):
         self.geometry("1600x1000")
         self.configure(fg_color=FIELD_DARK_GREEN)
 
-        # Load data in background
+        # Load models, data and the prediction table in background (in parallel)
         self.players_df = None
-        threading.Thread(target=self._load_data, daemon=True).start()
+        self.prediction_table = None
+        self.startup = prewarm(on_ready=self._on_startup_ready)
+
+        # Searches and predictions share a small pool; a new request supersedes the old one
+        self.tasks = TaskManager(lambda fn: self.after(0, fn), max_workers=2)
+        self.protocol("WM_DELETE_WINDOW", self._on_close)
 
         # Main container with scrollable frame
         self.main_container = ctk.CTkFrame(self, fg_color=FIELD_DARK_GREEN, corner_radius=0)
@@ -74,7 +81,30 @@ class App(ctk.CTk):
             text_color=WHITE,
             fg_color="transparent"
         )
-        self.label_subtitle.pack(pady=(0, 20))
+        self.label_subtitle.pack(pady=(0, 10))
+
+        # Progress animation toggle (power users can turn it off)
+        self.show_animation = True
+        self.switch_animation = ctk.CTkSwitch(
+            self.header_frame,
+            text="✨ Show progress animation",
+            command=self._toggle_animation,
+            font=("Roboto", 14),
+            text_color=WHITE,
+            progress_color=GOLD
+        )
+        self.switch_animation.select()
+        self.switch_animation.pack(pady=(0, 5))
+
+        # Startup readiness
+        self.label_status = ctk.CTkLabel(
+            self.header_frame,
+            text="⏳ Loading models and player database...",
+            font=("Roboto", 13),
+            text_color=WHITE,
+            fg_color="transparent"
+        )
+        self.label_status.pack(pady=(0, 10))
 
         # Create tabview for different input methods
         self.tabview = ctk.CTkTabview(
@@ -108,12 +138,12 @@ class App(ctk.CTk):
         self.frame_animation.pack(fill="both", expand=True, pady=(0, 0))
         self.frame_animation.pack_propagate(False)
 
-    def _load_data(self):
-        """Load player data in background"""
-        try:
-            self.players_df = load_and_combine()
-        except Exception as e:
-            print(f"Error loading data: {e}")
+    def _on_startup_ready(self, report):
+        """Called from the loader thread once prewarming is done"""
+        self.players_df = report.players_df
+        self.prediction_table = report.prediction_table
+        print(f"Startup {report.summary()}")
+        self.after(0, lambda: self.label_status.configure(text=f"✅ Ready ({report.timings['ready']:.1f}s)"))
 
     def _setup_direct_input_tab(self):
         """Setup the direct input tab"""
@@ -280,6 +310,72 @@ class App(ctk.CTk):
         )
         self.button_search.pack(side="left")
 
+        # Live suggestions while typing (debounced)
+        self.suggestion_frame = ctk.CTkFrame(self.tab_search, fg_color="transparent")
+        self.suggestion_frame.pack(pady=(0, 10))
+        self._suggest_after_id = None
+        self._suggest_state = None
+        self.entry_player.bind("<KeyRelease>", self._on_search_key)
+        self.entry_player.bind("<Return>", lambda event: self.start_search_thread())
+
+    def _on_search_key(self, event=None):
+        """Debounce keystrokes before refreshing suggestions"""
+        if event is not None and event.keysym == "Return":
+            return
+        if self._suggest_after_id is not None:
+            self.after_cancel(self._suggest_after_id)
+        self._suggest_after_id = self.after(SUGGEST_DEBOUNCE_MS, self._refresh_suggestions)
+
+    def _refresh_suggestions(self):
+        """Look up suggestions for the current entry text in the task pool"""
+        self._suggest_after_id = None
+        query = self.entry_player.get()
+        if not query.strip() or self.players_df is None:
+            self.tasks.cancel("suggest")
+            self._suggest_state = None
+            self._show_suggestions([])
+            return
+        self.tasks.submit("suggest", self._run_suggest, query, self._suggest_state)
+
+    def _run_suggest(self, task, query, previous):
+        """Compute top-K suggestions (reusing the previous keystroke's candidates)"""
+        from src.search import suggest_players
+        matches, state = suggest_players(query, self.players_df, k=SUGGEST_LIMIT, previous=previous)
+        names = matches['Player'].astype(str).tolist()
+        squads = matches['Squad'].astype(str).tolist() if 'Squad' in matches.columns else [""] * len(names)
+        task.ui(self._deliver_suggestions, state, list(zip(names, squads)))
+
+    def _deliver_suggestions(self, state, suggestions):
+        self._suggest_state = state
+        self._show_suggestions(suggestions)
+
+    def _show_suggestions(self, suggestions):
+        """Render suggestion buttons; clicking one searches for that player"""
+        for widget in self.suggestion_frame.winfo_children():
+            widget.destroy()
+        for name, squad in suggestions:
+            text = f"{name}  ·  {squad}" if squad and squad != "nan" else name
+            ctk.CTkButton(
+                self.suggestion_frame,
+                text=text,
+                width=650,
+                height=28,
+                anchor="w",
+                command=lambda n=name: self._pick_suggestion(n),
+                font=("Roboto", 14),
+                fg_color=FIELD_GREEN,
+                hover_color=FIELD_LIGHT_GREEN,
+                text_color=WHITE,
+                corner_radius=6
+            ).pack(pady=1)
+
+    def _pick_suggestion(self, name):
+        self.entry_player.delete(0, "end")
+        self.entry_player.insert(0, name)
+        self._suggest_state = None
+        self._show_suggestions([])
+        self.start_search_thread()
+
     def predict_from_input(self):
         """Predict from direct input values"""
         try:
@@ -292,36 +388,21 @@ class App(ctk.CTk):
                 self._show_message("⚠️ Invalid input values!\nPlease enter valid numbers:\n- Goals/Assists: ≥ 0\n- Minutes: ≥ 0\n- Age: 16-50", is_error=True)
                 return
             
-            # Start prediction in thread
-            threading.Thread(target=self._run_input_prediction, args=(goals, assists, minutes, age), daemon=True).start()
+            # Run prediction in the task pool (supersedes any running request)
+            self.tasks.submit("results", self._run_input_prediction, goals, assists, minutes, age)
         except ValueError:
             self._show_message("⚠️ Please enter valid numbers for all fields!", is_error=True)
 
-    def _run_input_prediction(self, goals, assists, minutes, age):
-        """Run prediction from input in background thread"""
-        # Clear frame
-        self.after_idle(self._clear_frame)
-        
-        # Animation steps
-        steps = [
-            "⚽ Processing Input Data...",
-            "🤖 Running ML Models...",
-            "📊 Calculating Predictions...",
-            "✨ Generating Results..."
-        ]
-        
-        for i, step in enumerate(steps):
-            step_text = step
-            delay_ms = i * 800
-            if i == 0:
-                self.after_idle(lambda s=step_text: self._show_step(s))
-            else:
-                self.after(delay_ms, lambda s=step_text: self._update_step(s))
-        
-        time.sleep(len(steps) * 0.8)
-        
-        # Generate predictions
+    def _run_input_prediction(self, task, goals, assists, minutes, age):
+        """Run prediction from input in the task pool"""
+        from src.predictor import predict_from_input
+        # Progress is reported by the real pipeline stages
+        self._emit_step(task, "⚽ Processing Input Data...", first=True)
+        self._emit_step(task, "🤖 Running ML Models...")
         result = predict_from_input(goals, assists, minutes, age)
+        if not task.is_current():
+            return
+        self._emit_step(task, "✨ Generating Results...")
         
         # Format results
         stats_text = (
@@ -341,60 +422,55 @@ class App(ctk.CTk):
             f"Estimated Transfer Value: ${round(result['market_value'], 2)}M\n"
         )
         
-        self.after(len(steps) * 800 + 500, lambda: self._show_results(stats_text, is_input=True))
+        task.ui(self._show_results, stats_text, True)
 
     def start_search_thread(self):
-        """Start search in background thread"""
-        threading.Thread(target=self.run_search_animation, daemon=True).start()
-
-    def run_search_animation(self):
-        """Run search and prediction animation"""
+        """Start search in the task pool (supersedes any running request)"""
         raw_query = self.entry_player.get()
         if not raw_query:
-            self.after_idle(lambda: self._show_message("⚠️ Please enter a player name or query!", is_error=True))
+            self.tasks.cancel("results")
+            self._show_message("⚠️ Please enter a player name or query!", is_error=True)
             return
-        
+        self.tasks.submit("results", self.run_search_animation, raw_query)
+
+    def run_search_animation(self, task, raw_query):
+        """Run search and prediction animation"""
+        from src.search import smart_search
+        from src.status_check import is_active
+        from src.utils import is_missing
+        from src.predictor import predict_player, format_market_value
+        from src.history import PlayerHistory
         if self.players_df is None:
-            self.after_idle(lambda: self._show_message("⏳ Loading player database...\nPlease wait and try again.", is_error=False))
+            task.ui(self._show_message, "⏳ Loading player database...\nPlease wait and try again.", False)
             return
 
-        # Clear frame
-        self.after_idle(self._clear_frame)
-
         # Search player using smart_search
+        self._emit_step(task, "🔍 Searching Player Database...", first=True)
         player = smart_search(raw_query, self.players_df)
         if player is None:
-            self.after_idle(lambda q=raw_query: self._show_message(f"❌ No matching player or result found for: '{q}'", is_error=True))
+            task.ui(self._show_message, f"❌ No matching player or result found for: '{raw_query}'", True)
+            return
+        if not task.is_current():
             return
 
-        # Animation steps
-        steps = [
-            "⚽ Loading Player Data...",
-            "🤖 Selecting ML Features...",
-            "📊 Processing with Models...",
-            "✨ Generating Predictions..."
-        ]
-
-        for i, step in enumerate(steps):
-            step_text = step
-            delay_ms = i * 800
-            if i == 0:
-                self.after_idle(lambda s=step_text: self._show_step(s))
-            else:
-                self.after(delay_ms, lambda s=step_text: self._update_step(s))
-
-        time.sleep(len(steps) * 0.8)
-
-        # Generate predictions
-        pred_value = predict_player_value(player)
-        pred_perf = predict_performance(player)
+        # Generate predictions (stored table first, live models otherwise)
+        self._emit_step(task, "📊 Processing with Models...")
+        prediction = None
+        if self.prediction_table is not None and not self.prediction_table.is_stale(self.players_df):
+            prediction = self.prediction_table.lookup_row(player)
+        if prediction is None:
+            prediction = predict_player(player)
+        if not task.is_current():
+            return
+        self._emit_step(task, "✨ Generating Predictions...")
+        pred_value = format_market_value(prediction)
         status = "✅ ACTIVE" if is_active(player) else "❌ RETIRED / INACTIVE"
 
         def safe_get(data, key, default='Unknown'):
             if hasattr(data, 'get'):
                 try:
                     val = data.get(key, default)
-                    return val if val is not None and val != '' else default
+                    return default if is_missing(val) else val
                 except:
                     try:
                         return data[key] if key in data else default
@@ -402,6 +478,19 @@ class App(ctk.CTk):
                         return default
             return default
 
+        # Prior season from the (PlayerID, Season) history, if there is one
+        previous_text = ""
+        previous = PlayerHistory.for_dataframe(self.players_df).previous_for_row(player)
+        if previous is not None:
+            previous_text = (
+                f"📅 PREVIOUS SEASON ({safe_get(previous, 'Season')})\n"
+                f"{'='*50}\n"
+                f"Club: {safe_get(previous, 'Squad')}\n"
+                f"Goals: {safe_get(previous, 'Gls')}\n"
+                f"Assists: {safe_get(previous, 'Ast')}\n"
+                f"Minutes Played: {safe_get(previous, 'MP')}\n\n"
+            )
+
         # Format results
         stats_text = (
             f"👤 PLAYER INFORMATION\n"
@@ -415,16 +504,34 @@ class App(ctk.CTk):
             f"Assists: {safe_get(player, 'Ast')}\n"
             f"Minutes Played: {safe_get(player, 'MP')}\n"
             f"Status: {status}\n\n"
+            f"{previous_text}"
             f"🎯 NEXT MATCH PREDICTION\n"
             f"{'='*50}\n"
-            f"Predicted Goals: {pred_perf['predicted_goals']}\n"
-            f"Predicted Assists: {pred_perf['predicted_assists']}\n\n"
+            f"Predicted Goals: {prediction['predicted_goals']}\n"
+            f"Predicted Assists: {prediction['predicted_assists']}\n\n"
             f"💰 MARKET VALUE ESTIMATE\n"
             f"{'='*50}\n"
             f"Estimated Transfer Value: {pred_value}\n"
         )
 
-        self.after(len(steps) * 800 + 500, lambda: self._show_results(stats_text, is_input=False))
+        task.ui(self._show_results, stats_text, False)
+
+    def _emit_step(self, task, step_text, first=False):
+        """Report a pipeline stage of task to the UI; no-op when the animation is off"""
+        if not self.show_animation:
+            if first:
+                task.ui(self._clear_frame)
+            return
+        task.ui(self._show_step if first else self._update_step, step_text)
+
+    def _on_close(self):
+        """Drop pending background work and close the window"""
+        self.tasks.shutdown()
+        self.destroy()
+
+    def _toggle_animation(self):
+        """Turn the progress animation on or off"""
+        self.show_animation = bool(self.switch_animation.get())
 
     def _clear_frame(self):
         """Thread-safe frame clearing"""
@@ -468,6 +575,9 @@ class App(ctk.CTk):
 
     def _show_results(self, stats_text, is_input=False):
         """Thread-safe results display with scrollable text"""
+        if "first_prediction" not in self.startup.timings:
+            self.startup.mark("first_prediction")
+            print(f"Startup {self.startup.summary()}")
         for widget in self.frame_animation.winfo_children():
             widget.destroy()
 
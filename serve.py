@@ -0,0 +1,24 @@
+#!/usr/bin/env python3
+"""
+Script to run the headless prediction service (HTTP/JSON)
+Loads the models and player database once and serves predictions without the GUI
+"""
+import argparse
+import sys
+import os
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from src.server import main
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Football AI prediction service")
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to bind (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8765, help="Port to listen on (default: 8765)")
+    args = parser.parse_args()
+
+    try:
+        main(args.host, args.port)
+    except KeyboardInterrupt:
+        print("Prediction server stopped")
@@ -0,0 +1,217 @@
+# src/benchmark.py
+"""
+Headless benchmark harness for the load, search, train and predict hot paths
+Each case is run several times and reported as p50/p95 latency, throughput
+and the peak memory allocated during one extra (traced) call. Results are
+written as a JSON baseline, and a previous baseline can be compared against
+to flag regressions. Search and batch-scoring cases run at several dataset
+sizes (the loaded player table resampled to n rows); loading and training
+run against a generated Season CSV of n rows (see synthetic.write_csv).
+"""
+import json
+import os
+import platform
+import resource
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+import numpy as np
+
+from .data_loader import load_and_combine
+from .search import smart_search, SEARCH_CACHE
+from .search_index import build_indexes
+from . import predictor
+from .model_trainer import prepare_data, train_models
+from . import player_store
+from .synthetic import write_csv
+
+# smart_search queries per kind (exact name is taken from the data)
+SEARCH_QUERIES = {
+    "fuzzy_name": None,  # exact name with a typo, filled in from the data
+    "superlative": "top scorer",
+    "numeric": "more than 10 goals",
+    "no_match": "zzzz qqqq",
+}
+
+BENCHMARK_FORMAT_VERSION = 1
+
+def _peak_rss_mb():
+    """Peak resident set size of the whole process so far, in MB"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+def _peak_alloc_mb(func):
+    """
+    Peak memory allocated during one call of func, in MB. Counts Python
+    objects and NumPy buffers (tracemalloc), not memory-mapped files.
+    """
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak / (1024 * 1024)
+
+def measure(func, repeat=20, warmup=1, items=1):
+    """
+    Time func() `repeat` times after `warmup` untimed calls, then trace
+    one more call for its peak allocation (kept out of the timings).
+    items is the work per call (e.g. rows scored) used for throughput.
+    """
+    for _ in range(warmup):
+        func()
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    times = np.asarray(times)
+    return {
+        "runs": repeat,
+        "p50_ms": float(np.percentile(times, 50) * 1000),
+        "p95_ms": float(np.percentile(times, 95) * 1000),
+        "mean_ms": float(times.mean() * 1000),
+        "throughput_per_s": float(items / times.mean()) if times.mean() > 0 else None,
+        "items_per_call": items,
+        "peak_alloc_mb": round(_peak_alloc_mb(func), 1),
+    }
+
+def resample(df, n, seed=0):
+    """df resampled (with replacement) to n rows, with a fresh index and search indexes"""
+    if n == len(df):
+        scaled = df.copy()
+    else:
+        positions = np.random.default_rng(seed).integers(0, len(df), n)
+        scaled = df.iloc[positions].reset_index(drop=True)
+    scaled.attrs.pop("data_version", None)
+    build_indexes(scaled)
+    return scaled
+
+def _typo(name):
+    """name with two adjacent letters swapped in the middle"""
+    if len(name) < 4:
+        return name
+    i = len(name) // 2
+    return name[:i - 1] + name[i] + name[i - 1] + name[i + 1:]
+
+@contextmanager
+def season_csv(n_rows, seed=0):
+    """
+    Point every loader at a generated Season CSV of n_rows rows (through
+    FOOTBALL_AI_SEASON_CSV) with its columnar store in a temporary
+    directory, so the real data/store are left alone.
+    """
+    previous_csv = os.environ.get(player_store.SEASON_CSV_ENV)
+    previous_store = player_store.STORE_DIR
+    with tempfile.TemporaryDirectory(prefix="football-ai-bench-") as tmp:
+        path = os.path.join(tmp, f"season_{n_rows}.csv")
+        write_csv(path, n_rows, seed=seed)
+        os.environ[player_store.SEASON_CSV_ENV] = path
+        player_store.STORE_DIR = os.path.join(tmp, "store")
+        try:
+            yield path
+        finally:
+            player_store.STORE_DIR = previous_store
+            if previous_csv is None:
+                os.environ.pop(player_store.SEASON_CSV_ENV, None)
+            else:
+                os.environ[player_store.SEASON_CSV_ENV] = previous_csv
+
+def _uncached_search(query, df):
+    def run():
+        SEARCH_CACHE.clear()
+        smart_search(query, df)
+    return run
+
+def run_benchmarks(sizes=None, repeat=20, include_training=True, log=print):
+    """
+    Run every benchmark case and return the results dict.
+
+    Args:
+        sizes: player table sizes (rows) for the search and batch cases,
+            and Season CSV sizes for the load and training cases; the
+            shipped data only by default
+        repeat: timed runs per case (training runs use fewer)
+        include_training: also time prepare_data and train_models (slow)
+    """
+    results = {}
+
+    def record(name, result):
+        results[name] = result
+        log(f"{name:<36} p50 {result['p50_ms']:>10.3f} ms   p95 {result['p95_ms']:>10.3f} ms   "
+            f"peak alloc {result['peak_alloc_mb']:>7.1f} MB")
+
+    record("load_and_combine", measure(load_and_combine, repeat=max(3, repeat // 4)))
+    df = load_and_combine()
+    predictor._ensure_models_loaded()
+
+    sample_name = str(df['Player'].dropna().iloc[len(df) // 2]) if 'Player' in df.columns else ""
+    queries = dict(SEARCH_QUERIES, exact_name=sample_name, fuzzy_name=_typo(sample_name))
+
+    rng = np.random.default_rng(0)
+    inputs = np.column_stack([
+        rng.integers(0, 30, 256), rng.integers(0, 20, 256),
+        rng.integers(0, 3400, 256), rng.integers(17, 38, 256)
+    ]).astype(float)
+    calls = iter(range(1 << 30))
+    def predict_one():
+        goals, assists, minutes, age = inputs[next(calls) % len(inputs)]
+        predictor.predict_from_input(goals, assists, minutes, age)
+    record("predict_from_input", measure(predict_one, repeat=repeat * 5))
+
+    for n in sizes or [len(df)]:
+        scaled = resample(df, n)
+        for kind in ("exact_name", "fuzzy_name", "superlative", "numeric", "no_match"):
+            record(f"smart_search[{kind}]@{n}", measure(_uncached_search(queries[kind], scaled), repeat=repeat))
+        record(f"predict_batch@{n}", measure(lambda: predictor.predict_batch(scaled), repeat=max(3, repeat // 4), items=n))
+
+    if include_training:
+        record("prepare_data", measure(prepare_data, repeat=max(3, repeat // 4)))
+        record("train_models", measure(lambda: train_models(save=False), repeat=1, warmup=0))
+
+    # loading and training at each size read a generated Season CSV of n rows
+    for n in sizes or []:
+        with season_csv(n):
+            record(f"load_and_combine@{n}", measure(load_and_combine, repeat=max(3, repeat // 4)))
+            if include_training:
+                record(f"prepare_data@{n}", measure(prepare_data, repeat=max(3, repeat // 4)))
+                record(f"train_models@{n}", measure(lambda: train_models(save=False), repeat=1, warmup=0))
+
+    return {
+        "format_version": BENCHMARK_FORMAT_VERSION,
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "players": len(df),
+        "peak_rss_mb": round(_peak_rss_mb(), 1),
+        "results": results,
+    }
+
+def compare(current, baseline, threshold=0.2, metric="p50_ms"):
+    """
+    Cases whose `metric` got worse than the baseline by more than threshold
+    (a fraction). Returns a list of (case, baseline value, current value, change).
+    """
+    regressions = []
+    for name, result in current["results"].items():
+        before = baseline.get("results", {}).get(name)
+        if before is None or not before.get(metric):
+            continue
+        change = result[metric] / before[metric] - 1
+        if change > threshold:
+            regressions.append((name, before[metric], result[metric], change))
+    return regressions
+
+def save_results(results, path):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=1)
+
+def load_results(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
@@ -0,0 +1,98 @@
+# src/coalescer.py
+"""
+Micro-batching request coalescer in front of the Random Forest models.
+Concurrent callers submit single feature rows; a worker thread flushes them
+as one matrix every max_batch rows or max_wait_ms milliseconds, so the
+per-call sklearn predict overhead is paid once per batch instead of once
+per request.
+"""
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+import numpy as np
+
+from . import predictor
+
+class PredictionCoalescer:
+    """Coalesces concurrent single-row predictions into batched predict calls"""
+
+    def __init__(self, max_batch=64, max_wait_ms=2.0):
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000.0
+        self.batches = 0
+        self.rows = 0
+        self._queue = queue.Queue()
+        self._closed = False
+        self._worker = threading.Thread(target=self._run, name="prediction-coalescer", daemon=True)
+        self._worker.start()
+
+    def submit(self, goals, assists, minutes_played, age) -> Future:
+        """Queue one row; the Future resolves to a predict_from_input-style dict"""
+        if self._closed:
+            raise RuntimeError("coalescer is closed")
+        future = Future()
+        self._queue.put(((goals, assists, minutes_played, age), future))
+        return future
+
+    def predict(self, goals, assists, minutes_played, age):
+        """Blocking convenience wrapper around submit()"""
+        return self.submit(goals, assists, minutes_played, age).result()
+
+    def stats(self):
+        """Number of flushed batches and rows, and the mean batch size"""
+        return {
+            "batches": self.batches,
+            "rows": self.rows,
+            "mean_batch": round(self.rows / self.batches, 2) if self.batches else 0.0
+        }
+
+    def close(self):
+        """Stop the worker after flushing everything already queued"""
+        self._closed = True
+        self._queue.put(None)
+        self._worker.join()
+
+    def _collect(self):
+        """Block for the first request, then gather more until the batch is full or max_wait expires"""
+        first = self._queue.get()
+        if first is None:
+            return None
+        pending = [first]
+        deadline = time.monotonic() + self.max_wait
+        while len(pending) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            try:
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                self._closed = True
+                break
+            pending.append(item)
+        return pending
+
+    def _run(self):
+        while True:
+            pending = self._collect()
+            if pending is None:
+                return
+            requests = [(row, future) for row, future in pending if future.set_running_or_notify_cancel()]
+            if requests:
+                self._flush(requests)
+            if self._closed and self._queue.empty():
+                return
+
+    def _flush(self, requests):
+        try:
+            features = np.array([row for row, _ in requests], dtype=float)
+            results = predictor.predict_features(features)
+        except Exception as e:
+            for _, future in requests:
+                future.set_exception(e)
+            return
+        self.batches += 1
+        self.rows += len(requests)
+        for i, (_, future) in enumerate(requests):
+            future.set_result({key: float(values[i]) for key, values in results.items()})
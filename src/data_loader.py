@@ -1,28 +1,117 @@
+import numpy as np
 import pandas as pd
-import os
-
-def load_and_combine():
-    # Get the directory where this script is located
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    # Get the parent directory (ve folder)
-    ve_dir = os.path.dirname(script_dir)
-    
-    # CSV paths (relative to ve directory)
-    csv1_path = os.path.join(ve_dir, "data", "All_Players.csv")
-    csv2_path = os.path.join(ve_dir, "data", "Season.csv")
-
-    # Load CSVs
-    df1 = pd.read_csv(csv1_path)
-    df2 = pd.read_csv(csv2_path)
+
+from .player_store import read_table, source_csvs
+from .search_index import build_indexes, _cached_for
+from .history import PlayerHistory
+
+# Text fields with few distinct values, stored as pandas categoricals
+CATEGORICAL_COLUMNS = ["Squad", "League", "Nation", "Pos", "Season"]
+
+# Free-text fields kept as plain strings
+TEXT_COLUMNS = ["Player"]
+
+# Whole-number columns stored as nullable integers when every value is integral
+INTEGER_COLUMNS = {
+    "PlayerID": "Int32",
+    "Age": "Int16",
+    "Born": "Int16",
+    "MP": "Int16",
+    "Starts": "Int16",
+    "Subs": "Int16",
+    "unSub": "Int16",
+}
+
+def apply_schema(df):
+    """
+    Convert a combined player DataFrame to compact typed columns.
+
+    Numeric stats become float32 (or nullable Int16/Int32 for whole-number
+    columns), low-cardinality text fields become categoricals. Missing values
+    stay as NaN/<NA> instead of a sentinel string.
+    """
+    typed = {}
+    for col in df.columns:
+        series = df[col]
+        if col in CATEGORICAL_COLUMNS:
+            typed[col] = series.astype("category")
+        elif col in TEXT_COLUMNS:
+            typed[col] = series
+        else:
+            numeric = pd.to_numeric(series, errors="coerce")
+            if numeric.isna().all() and series.notna().any():
+                # Not a numeric column at all - keep the text
+                typed[col] = series
+                continue
+            int_dtype = INTEGER_COLUMNS.get(col)
+            present = numeric.dropna()
+            if int_dtype and (present == present.round()).all():
+                typed[col] = numeric.astype(int_dtype)
+            else:
+                typed[col] = numeric.astype("float32")
+    return pd.DataFrame(typed, index=df.index)
+
+# Incremented on every load; stored in df.attrs["data_version"] so caches can key on it
+DATA_VERSION = 0
+
+# Callbacks run after every (re)load, e.g. to clear result caches
+_reload_listeners = []
+
+def on_reload(callback):
+    """Register callback(df) to be called whenever load_and_combine loads data"""
+    _reload_listeners.append(callback)
+
+def data_version(df):
+    """Version number of a DataFrame returned by load_and_combine, or None"""
+    return df.attrs.get("data_version")
+
+def load_and_combine(columns=None):
+    """
+    Load both player CSVs (through the columnar store) and combine them.
+
+    Args:
+        columns: Optional list of columns to load; all columns by default
+    """
+    # CSV paths (data/Season.csv can be swapped for another file, see source_csvs)
+    csv1_path, csv2_path = source_csvs()
+
+    # Load CSVs from the converted store (rebuilt automatically when a CSV changes)
+    df1 = read_table(csv1_path, columns)
+    df2 = read_table(csv2_path, columns)
 
     # Combine both CSVs into one DataFrame
     combined_df = pd.concat([df1, df2], ignore_index=True)
 
-    # Remove duplicate players based on the 'Player' column
-    combined_df = combined_df.drop_duplicates(subset="Player")
+    history = None
+    if "PlayerID" in combined_df.columns and "Season" in combined_df.columns:
+        # One row per (PlayerID, Season), the later file wins; every season is
+        # kept in the history and the table itself holds each player's latest season
+        seasons = apply_schema(combined_df.drop_duplicates(subset=["PlayerID", "Season"], keep="last"))
+        history = PlayerHistory(seasons)
+        latest = np.zeros(len(seasons), dtype=bool)
+        latest[history.latest_positions()] = True
+        # rows without a PlayerID have no history and are kept as they are
+        latest |= seasons["PlayerID"].isna().to_numpy()
+        combined_df = seasons[latest]
+    else:
+        # Remove duplicate players based on the 'Player' column
+        if "Player" in combined_df.columns:
+            combined_df = combined_df.drop_duplicates(subset="Player")
+
+        # Compact typed columns; missing values stay as NaN/<NA>
+        combined_df = apply_schema(combined_df)
+
+    # Build the search indexes once at load time
+    build_indexes(combined_df)
+    if history is not None:
+        _cached_for(combined_df, "history", lambda df: history)
 
-    # Fill missing values with 'Unknown'
-    combined_df = combined_df.fillna("Unknown")
+    # Tag the data with a new version and invalidate dependent caches
+    global DATA_VERSION
+    DATA_VERSION += 1
+    combined_df.attrs["data_version"] = DATA_VERSION
+    for callback in _reload_listeners:
+        callback(combined_df)
 
     return combined_df
 print("suii")
\ No newline at end of file
@@ -0,0 +1,85 @@
+# src/history.py
+"""
+Multi-season player history keyed by (PlayerID, Season).
+Every season row is kept, sorted by PlayerID then Season, so each player's
+career is one contiguous slice found in O(1) through an offsets array.
+"""
+import numpy as np
+import pandas as pd
+
+from .search_index import _cached_for
+
+class PlayerHistory:
+    """
+    Season rows sorted by (PlayerID, Season).
+
+    offsets[i]:offsets[i + 1] is the career of player_ids[i]; a dict maps a
+    PlayerID to i. Rows without a PlayerID are not part of any career.
+    """
+
+    def __init__(self, seasons: pd.DataFrame):
+        ids = pd.to_numeric(seasons['PlayerID'], errors='coerce').to_numpy(dtype=float)
+        labels = seasons['Season'].astype(str).to_numpy() if 'Season' in seasons.columns \
+            else np.full(len(seasons), "", dtype=str)
+        order = np.lexsort((labels, ids))
+        order = order[~np.isnan(ids[order])]
+
+        # row positions in `seasons`, in (PlayerID, Season) order
+        self.positions = order
+        self.frame = seasons.iloc[order]
+        self.seasons = labels[order]
+        sorted_ids = ids[order].astype(np.int64)
+        starts = np.flatnonzero(np.r_[True, sorted_ids[1:] != sorted_ids[:-1]]) if len(order) \
+            else np.empty(0, dtype=np.intp)
+        self.player_ids = sorted_ids[starts]
+        self.offsets = np.r_[starts, len(order)]
+        self._slots = {pid: i for i, pid in enumerate(self.player_ids.tolist())}
+
+    @classmethod
+    def for_dataframe(cls, df: pd.DataFrame):
+        """
+        History registered for df by load_and_combine, or one built from df
+        itself (then only the seasons present in df are known)
+        """
+        return _cached_for(df, "history", cls)
+
+    def __len__(self):
+        return len(self.player_ids)
+
+    def span(self, player_id):
+        """(start, end) of a player's rows in frame, or None if unknown"""
+        try:
+            slot = self._slots.get(int(player_id))
+        except (TypeError, ValueError):
+            return None
+        if slot is None:
+            return None
+        return int(self.offsets[slot]), int(self.offsets[slot + 1])
+
+    def career(self, player_id) -> pd.DataFrame:
+        """Every season of a player, oldest first (possibly empty)"""
+        span = self.span(player_id)
+        if span is None:
+            return self.frame.iloc[0:0]
+        return self.frame.iloc[span[0]:span[1]]
+
+    def previous(self, player_id, season):
+        """The player's latest season row before `season` (pandas Series), or None"""
+        span = self.span(player_id)
+        if span is None:
+            return None
+        start, end = span
+        pos = start + int(np.searchsorted(self.seasons[start:end], str(season))) - 1
+        if pos < start:
+            return None
+        return self.frame.iloc[pos]
+
+    def latest_positions(self):
+        """Row positions (in the source frame) of every player's latest season"""
+        return self.positions[self.offsets[1:] - 1]
+
+    def previous_for_row(self, player_row):
+        """Season before the one in player_row (a Series with PlayerID and Season), or None"""
+        if hasattr(player_row, 'get'):
+            return self.previous(player_row.get('PlayerID'), player_row.get('Season'))
+        return None
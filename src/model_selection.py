@@ -0,0 +1,223 @@
+# src/model_selection.py
+"""
+Parallel cross-validated model selection for the forest models
+Runs k-fold CV over a hyperparameter grid for both targets at once on a
+process pool. The fold assignment, the per-fold scaled feature matrices and
+the targets are placed in shared memory once, so workers attach to them
+instead of receiving pickled copies with every task. Finished fold fits
+are cached by (target, params, fold, data hash), so re-runs only fit what
+is new. The result is a leaderboard of MAE/R² against fit time.
+"""
+import hashlib
+import itertools
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+
+import numpy as np
+
+try:
+    from .model_trainer import (
+        prepare_data, prepare_next_season_data, training_data_hash, TRAIN_DIR, DEFAULT_FOREST_PARAMS
+    )
+except ImportError:
+    # run as a script (python src/model_selection.py)
+    from model_trainer import (
+        prepare_data, prepare_next_season_data, training_data_hash, TRAIN_DIR, DEFAULT_FOREST_PARAMS
+    )
+
+# Default search space (every combination is cross-validated per target)
+DEFAULT_GRID = {
+    "n_estimators": [50, 100],
+    "max_depth": [6, 10, None],
+    "min_samples_leaf": [1, 4],
+}
+
+CV_CACHE_PATH = os.path.join(TRAIN_DIR, "cv_cache.json")
+LEADERBOARD_PATH = os.path.join(TRAIN_DIR, "leaderboard.json")
+
+# Worker-side views of the shared arrays (set by _attach)
+_SHARED = {}
+_SEGMENTS = []
+
+def _expand_grid(grid):
+    """List of parameter dicts for every combination in grid"""
+    keys = sorted(grid)
+    return [dict(zip(keys, values)) for values in itertools.product(*(grid[k] for k in keys))]
+
+def _params_key(params):
+    return json.dumps(params, sort_keys=True)
+
+def _load_dataset(dataset):
+    """(X, {target: y}) for 'synthetic' (the serving models) or 'next_season' data"""
+    if dataset == "next_season":
+        X, y_goals, y_assists, _ = prepare_next_season_data()
+        return X, {"goals": y_goals, "assists": y_assists}
+    X, y_perf, y_value = prepare_data()
+    return X, {"perf": y_perf, "value": y_value}
+
+def _share(arrays):
+    """Copy arrays into new shared memory blocks; returns (segments, spec for workers)"""
+    segments, spec = [], {}
+    for name, array in arrays.items():
+        array = np.ascontiguousarray(array)
+        shm = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+        np.ndarray(array.shape, dtype=array.dtype, buffer=shm.buf)[...] = array
+        segments.append(shm)
+        spec[name] = (shm.name, array.shape, array.dtype.str)
+    return segments, spec
+
+def _attach(spec):
+    """Pool initializer: map the shared arrays into this worker"""
+    for name, (shm_name, shape, dtype) in spec.items():
+        # workers share the parent's resource tracker; the parent unlinks the blocks
+        shm = shared_memory.SharedMemory(name=shm_name)
+        _SEGMENTS.append(shm)
+        _SHARED[name] = np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf)
+
+def _fit_fold(target, params, fold):
+    """Fit one candidate on all folds but `fold` and score it on `fold` (runs in a worker)"""
+    from sklearn.ensemble import RandomForestRegressor
+    from sklearn.metrics import mean_absolute_error, r2_score
+
+    X_scaled = _SHARED["X_scaled"][fold]
+    test = _SHARED["folds"] == fold
+    y = _SHARED[f"y_{target}"]
+
+    start = time.perf_counter()
+    model = RandomForestRegressor(**params, random_state=42, n_jobs=1)
+    model.fit(X_scaled[~test], y[~test])
+    seconds = time.perf_counter() - start
+    pred = model.predict(X_scaled[test])
+    return {
+        "mae": float(mean_absolute_error(y[test], pred)),
+        "r2": float(r2_score(y[test], pred)),
+        "seconds": seconds,
+    }
+
+def _load_cache():
+    try:
+        with open(CV_CACHE_PATH, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def _save_json(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp-{os.getpid()}"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=1)
+    os.replace(tmp_path, path)
+
+def select_models(grid=None, folds=5, workers=None, dataset="synthetic"):
+    """
+    Cross-validate every grid combination for every target of dataset.
+
+    Args:
+        grid: {param: [values]} for RandomForestRegressor (DEFAULT_GRID by default)
+        folds: number of CV folds
+        workers: process pool size (os.cpu_count() by default)
+        dataset: 'synthetic' (perf/value, the serving models) or 'next_season'
+            (real next-season goals/assists from the lag features)
+
+    Returns:
+        (leaderboard, best) where leaderboard is a list of dicts (target,
+        params, mae, r2, fit_seconds, cached) sorted by target then MAE, and
+        best maps each target to its lowest-MAE params
+    """
+    from sklearn.model_selection import KFold
+    from sklearn.preprocessing import StandardScaler
+
+    candidates = _expand_grid(grid or DEFAULT_GRID)
+    X, targets = _load_dataset(dataset)
+    if len(X) < folds:
+        raise ValueError(f"need at least {folds} samples for {folds}-fold CV, got {len(X)}")
+    data_hash = training_data_hash(X, *targets.values())
+
+    # fold assignment and one scaled copy of X per fold (scaler fit on the training part)
+    fold_ids = np.empty(len(X), dtype=np.int32)
+    for fold, (_, test) in enumerate(KFold(folds, shuffle=True, random_state=42).split(X)):
+        fold_ids[test] = fold
+    X_scaled = np.stack([
+        StandardScaler().fit(X[fold_ids != fold]).transform(X) for fold in range(folds)
+    ])
+
+    cache = _load_cache()
+    def cache_key(target, params, fold):
+        digest = hashlib.sha1(f"{dataset}|{target}|{_params_key(params)}|{fold}/{folds}|{data_hash}".encode())
+        return digest.hexdigest()
+
+    jobs = [
+        (target, params, fold)
+        for params in candidates for target in targets for fold in range(folds)
+        if cache_key(target, params, fold) not in cache
+    ]
+    total = len(candidates) * len(targets) * folds
+    print(f"Cross-validating {len(candidates)} candidates x {len(targets)} targets x {folds} folds "
+          f"({total - len(jobs)} cached, {len(jobs)} to fit)...")
+
+    started = time.perf_counter()
+    if jobs:
+        arrays = {"X_scaled": X_scaled, "folds": fold_ids}
+        arrays.update({f"y_{target}": y for target, y in targets.items()})
+        segments, spec = _share(arrays)
+        try:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_attach, initargs=(spec,)) as pool:
+                # targets are interleaved, so both are trained concurrently
+                futures = {pool.submit(_fit_fold, *job): job for job in jobs}
+                for done, future in enumerate(as_completed(futures), 1):
+                    target, params, fold = futures[future]
+                    cache[cache_key(target, params, fold)] = future.result()
+                    if done % 10 == 0 or done == len(jobs):
+                        print(f"  {done}/{len(jobs)} fits done")
+        finally:
+            for shm in segments:
+                shm.close()
+                shm.unlink()
+            _save_json(CV_CACHE_PATH, cache)
+    wall = time.perf_counter() - started
+
+    leaderboard = []
+    for target in targets:
+        for params in candidates:
+            scores = [cache[cache_key(target, params, fold)] for fold in range(folds)]
+            leaderboard.append({
+                "target": target,
+                "params": params,
+                "mae": float(np.mean([s["mae"] for s in scores])),
+                "r2": float(np.mean([s["r2"] for s in scores])),
+                "fit_seconds": float(np.sum([s["seconds"] for s in scores])),
+                "cached": not any(job[:2] == (target, params) for job in jobs),
+            })
+    leaderboard.sort(key=lambda row: (row["target"], row["mae"]))
+    best = {}
+    for row in leaderboard:
+        best.setdefault(row["target"], row["params"])
+
+    _save_json(LEADERBOARD_PATH, {
+        "dataset": dataset,
+        "data_hash": data_hash,
+        "folds": folds,
+        "wall_seconds": wall,
+        "default_params": DEFAULT_FOREST_PARAMS,
+        "leaderboard": leaderboard,
+    })
+    print_leaderboard(leaderboard)
+    print(f"Model selection took {wall:.1f}s; leaderboard saved to {LEADERBOARD_PATH}")
+    return leaderboard, best
+
+def print_leaderboard(leaderboard, top=5):
+    """Print the best `top` candidates per target"""
+    shown = {}
+    print(f"{'target':<8} {'MAE':>9} {'R²':>7} {'fit s':>7}  params")
+    for row in leaderboard:
+        if shown.get(row["target"], 0) >= top:
+            continue
+        shown[row["target"]] = shown.get(row["target"], 0) + 1
+        print(f"{row['target']:<8} {row['mae']:>9.4f} {row['r2']:>7.3f} {row['fit_seconds']:>7.2f}  "
+              f"{_params_key(row['params'])}")
+
+if __name__ == "__main__":
+    select_models()
@@ -5,11 +5,25 @@ Trains models to predict next match performance and market value
 import pandas as pd
 import numpy as np
 import os
+import json
+import math
+import threading
+import time
 import pickle
-from sklearn.ensemble import RandomForestRegressor
-from sklearn.model_selection import train_test_split
-from sklearn.preprocessing import StandardScaler
-from sklearn.metrics import mean_absolute_error, r2_score
+import hashlib
+from datetime import datetime, timezone
+
+try:
+    from .player_store import read_table, source_csvs
+except ImportError:
+    # run as a script (python src/model_trainer.py)
+    from player_store import read_table, source_csvs
+
+# Raw columns the feature pipeline reads
+TRAINING_COLUMNS = ['Gls', 'Ast', 'MP', 'Min', 'Age']
+
+# Identity of a training row; incremental training diffs on it
+KEY_COLUMNS = ['PlayerID', 'Season']
 
 def safe_convert(value, default=0):
     """Safely convert value to float"""
@@ -20,101 +34,405 @@ def safe_convert(value, default=0):
     except (ValueError, TypeError):
         return default
 
-def prepare_data():
-    """Load and prepare data from CSV files"""
-    # Get the directory where this script is located
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    # Get the parent directory (ve folder)
-    ve_dir = os.path.dirname(script_dir)
-    
-    # CSV paths
-    csv1_path = os.path.join(ve_dir, "data", "All_Players.csv")
-    csv2_path = os.path.join(ve_dir, "data", "Season.csv")
-    
-    # Load CSVs
-    df1 = pd.read_csv(csv1_path)
-    df2 = pd.read_csv(csv2_path)
+def _numeric_feature(df, column, default=0):
+    """Column converted to float like safe_convert (bad or missing values -> default)"""
+    return pd.to_numeric(df[column], errors='coerce').fillna(default).to_numpy(dtype=float)
+
+def engineer_features(df, return_mask=False):
+    """
+    Columnar feature/target pipeline.
+
+    Produces the same features and synthetic targets as the original
+    row-by-row loop, using column arithmetic and NumPy masks.
+
+    Returns:
+        (X, y_perf, y_value) NumPy arrays
+    """
+    n_rows = len(df)
+
+    # Input features (columns that don't exist fall back to the row.get defaults)
+    goals = _numeric_feature(df, 'Gls') if 'Gls' in df.columns else np.zeros(n_rows)
+    assists = _numeric_feature(df, 'Ast') if 'Ast' in df.columns else np.zeros(n_rows)
+    minutes = _numeric_feature(df, 'MP') if 'MP' in df.columns else np.zeros(n_rows)  # Matches played
+    age = _numeric_feature(df, 'Age') if 'Age' in df.columns else np.full(n_rows, 25.0)
+
+    # Calculate minutes played (if Min column exists, use it, otherwise estimate from MP)
+    min_played = _numeric_feature(df, 'Min') if 'Min' in df.columns else minutes * 90
+
+    # Skip rows with invalid data
+    valid = ~((goals < 0) | (assists < 0) | (minutes < 0) | (age < 16) | (age > 50))
+    goals, assists, min_played, age = goals[valid], assists[valid], min_played[valid], age[valid]
+
+    # Features: goals, assists, minutes played, age
+    features = np.column_stack([goals, assists, min_played, age])
+
+    # Performance target: synthetic next match performance score based on
+    # current form, age, and playing time.
+    # Real next-season targets: see engineer_lag_features / prepare_next_season_data
+    base_performance = goals + assists * 0.8  # Assists weighted slightly less
+
+    # Age factor (peak performance around 25-28, growing potential before, decline after)
+    age_multiplier = np.select(
+        [(age >= 23) & (age <= 28), age < 23],
+        [1.1, 0.95 + (age - 18) * 0.03],
+        default=1.0 - (age - 28) * 0.02
+    )
+
+    # Playing time factor (regular starter > 2000 minutes)
+    time_factor = np.select([min_played > 2000, min_played > 1000], [1.0, 0.9], default=0.7)
+
+    # Predicted next match performance (goals + assists), per match estimate
+    predicted_performance = base_performance * age_multiplier * time_factor * 0.15
+    performance_targets = np.maximum(0, predicted_performance)
+
+    # Market value target: based on goals, assists, age, and playing time
+    base_value = (goals * 2.5) + (assists * 1.8)
+
+    # Age premium/discount (young players have higher potential value)
+    age_value_factor = np.select([age < 23, age <= 28], [1.3, 1.0], default=0.6 - (age - 28) * 0.05)
+
+    # Playing time consistency factor (full season is ~2500-3000 mins)
+    consistency_factor = np.minimum(1.0, min_played / 2500)
+
+    # Estimated market value in millions
+    estimated_value = (base_value * age_value_factor * consistency_factor) / 10
+    value_targets = np.maximum(0.1, estimated_value)
+
+    if return_mask:
+        return features, performance_targets, value_targets, valid
+    return features, performance_targets, value_targets
+
+def _source_csvs():
+    """Paths of the CSVs the models are trained on"""
+    return source_csvs()
+
+def load_training_rows(extra_columns=(), unique=False):
+    """
+    Training columns of both CSVs plus the (PlayerID, Season) row key.
+    Every row is kept, as prepare_data always did; with unique=True there is
+    one row per key instead (a later file wins over an earlier one).
+    """
+    # Load only the columns the pipeline uses from the columnar store
+    columns = KEY_COLUMNS + TRAINING_COLUMNS + [c for c in extra_columns if c not in TRAINING_COLUMNS]
+    frames = [read_table(path, columns) for path in _source_csvs()]
     
     # Combine both CSVs
-    df = pd.concat([df1, df2], ignore_index=True)
-    
-    # Prepare features and targets
-    features = []
-    performance_targets = []  # For next match performance (goals + assists)
-    value_targets = []  # For market value estimation
-    
-    for idx, row in df.iterrows():
-        # Input features
-        goals = safe_convert(row.get('Gls', 0))
-        assists = safe_convert(row.get('Ast', 0))
-        minutes = safe_convert(row.get('MP', 0))  # Matches played
-        age = safe_convert(row.get('Age', 25))
-        
-        # Skip rows with invalid data
-        if goals < 0 or assists < 0 or minutes < 0 or age < 16 or age > 50:
-            continue
-        
-        # Calculate minutes played (if Min column exists, use it, otherwise estimate from MP)
-        min_played = safe_convert(row.get('Min', minutes * 90))
-        
-        # Features: goals, assists, minutes played, age
-        features.append([goals, assists, min_played, age])
-        
-        # For performance prediction: predict next match goals and assists
-        # We'll use a simple approach: if we have historical data, use trends
-        # Otherwise, use current stats as baseline
-        # For training, we'll create synthetic targets based on patterns
-        # In a real scenario, you'd use next season/match data
-        
-        # Performance target: next match performance score
-        # Based on current form, age, and playing time
-        base_performance = goals + assists * 0.8  # Assists weighted slightly less
-        
-        # Age factor (peak performance around 25-28)
-        if 23 <= age <= 28:
-            age_multiplier = 1.1
-        elif age < 23:
-            age_multiplier = 0.95 + (age - 18) * 0.03  # Growing potential
-        else:
-            age_multiplier = 1.0 - (age - 28) * 0.02  # Decline after 28
-        
-        # Playing time factor
-        if min_played > 2000:  # Regular starter
-            time_factor = 1.0
-        elif min_played > 1000:
-            time_factor = 0.9
-        else:
-            time_factor = 0.7
-        
-        # Predicted next match performance (goals + assists)
-        predicted_performance = base_performance * age_multiplier * time_factor * 0.15  # Per match estimate
-        performance_targets.append(max(0, predicted_performance))
-        
-        # Market value target: based on goals, assists, age, and playing time
-        # Formula: base value from performance, adjusted by age and consistency
-        base_value = (goals * 2.5) + (assists * 1.8)
-        
-        # Age premium/discount
-        if age < 23:
-            age_value_factor = 1.3  # Young players have higher potential value
-        elif age <= 28:
-            age_value_factor = 1.0  # Peak age
+    df = pd.concat(frames, ignore_index=True)
+    if unique and all(col in df.columns for col in KEY_COLUMNS):
+        df = df.drop_duplicates(subset=KEY_COLUMNS, keep="last").reset_index(drop=True)
+    return df
+
+def build_training_arrays(df):
+    """
+    Per-row features and targets for every row of df.
+    Returns (valid, X, y_perf, y_value); rows failing validation have
+    valid == False and zero features/targets.
+    """
+    features, y_perf, y_value, valid = engineer_features(df, return_mask=True)
+    X = np.zeros((len(df), features.shape[1]))
+    perf = np.zeros(len(df))
+    value = np.zeros(len(df))
+    X[valid], perf[valid], value[valid] = features, y_perf, y_value
+    return valid, X, perf, value
+
+def prepare_data():
+    """Load and prepare data from CSV files"""
+    valid, X, y_perf, y_value = build_training_arrays(load_training_rows())
+    return X[valid], y_perf[valid], y_value[valid]
+
+# Season stats carried over as prior-season features and next-season targets
+LAG_COLUMNS = ['Gls', 'Ast', 'Min', 'xG', 'npxG']
+
+# Features of the next-season data set: current season, previous season, per-90 deltas
+NEXT_SEASON_FEATURES = (
+    ['Gls', 'Ast', 'Min', 'Age']
+    + [f"prev_{col}" for col in LAG_COLUMNS]
+    + ['has_prev', 'Gls_p90_delta', 'Ast_p90_delta', 'xG_p90_delta']
+)
+
+def _season_start(labels):
+    """First year of season labels like '2024-2025' (NaN if unparseable)"""
+    return pd.to_numeric(pd.Series(labels).astype(str).str[:4], errors='coerce').to_numpy(dtype=float)
+
+def engineer_lag_features(df):
+    """
+    Prior-season features and true next-season targets in one columnar pass.
+
+    Rows are sorted once by (PlayerID, Season); in that order a player's
+    seasons are adjacent, so a grouped shift is a plain shift masked where
+    the PlayerID changes or the seasons are not consecutive. No per-player
+    loops, so the cost after the sort is linear in the number of rows.
+
+    Adds prev_<col> and next_<col> for every LAG_COLUMNS column present,
+    per-90 rates and their change from the previous season (<col>_p90_delta),
+    has_prev/has_next flags and the player's season number (seasons_played).
+    Returns a new DataFrame in (PlayerID, Season) order with df's index labels.
+    """
+    ids = pd.to_numeric(df['PlayerID'], errors='coerce').to_numpy(dtype=float)
+    years = _season_start(df['Season'].to_numpy())
+    order = np.lexsort((years, ids))
+    out = df.iloc[order].copy()
+    ids, years = ids[order], years[order]
+
+    # consecutive seasons of the same player
+    linked = np.zeros(len(out), dtype=bool)
+    if len(out) > 1:
+        linked[1:] = (ids[1:] == ids[:-1]) & (years[1:] - years[:-1] == 1)
+    has_prev = linked
+    has_next = np.r_[linked[1:], False]
+
+    def shifted(values, step):
+        result = np.full(len(values), np.nan)
+        if step > 0:
+            result[1:] = values[:-1]
+            result[~has_prev] = np.nan
         else:
-            age_value_factor = 0.6 - (age - 28) * 0.05  # Declining value
-        
-        # Playing time consistency factor
-        consistency_factor = min(1.0, min_played / 2500)  # Full season is ~2500-3000 mins
-        
-        # Estimated market value in millions
-        estimated_value = (base_value * age_value_factor * consistency_factor) / 10
-        value_targets.append(max(0.1, estimated_value))
-    
-    return np.array(features), np.array(performance_targets), np.array(value_targets)
+            result[:-1] = values[1:]
+            result[~has_next] = np.nan
+        return result
+
+    minutes = _numeric_feature(out, 'Min') if 'Min' in out.columns else np.zeros(len(out))
+    nineties = np.where(minutes > 0, minutes / 90, np.nan)
+    prev_nineties = shifted(nineties, 1)
+    for col in LAG_COLUMNS:
+        if col not in out.columns:
+            continue
+        values = pd.to_numeric(out[col], errors='coerce').to_numpy(dtype=float)
+        out[f"prev_{col}"] = shifted(values, 1)
+        out[f"next_{col}"] = shifted(values, -1)
+        if col != 'Min':
+            per90 = values / nineties
+            out[f"{col}_p90"] = per90
+            out[f"{col}_p90_delta"] = per90 - shifted(values, 1) / prev_nineties
+
+    out['has_prev'] = has_prev
+    out['has_next'] = has_next
+    # 0 for a player's first season, 1 for the second, ...
+    first = np.r_[True, ids[1:] != ids[:-1]] if len(out) else np.empty(0, dtype=bool)
+    starts = np.maximum.accumulate(np.where(first, np.arange(len(out)), 0)) if len(out) else first
+    out['seasons_played'] = np.arange(len(out)) - starts
+    return out
+
+def prepare_next_season_data():
+    """
+    Training data with real targets: every season that has a following
+    season for the same player.
+
+    Used for evaluation only (model_selection with dataset='next_season',
+    train_models.py --select-next-season); the served models are still
+    trained on the synthetic targets of prepare_data.
+
+    Returns:
+        (X, y_goals, y_assists, feature_names) with X built from
+        NEXT_SEASON_FEATURES (missing prior-season values as 0) and the
+        targets taken from the next season's Gls and Ast
+    """
+    lagged = engineer_lag_features(load_training_rows(LAG_COLUMNS, unique=True))
+    rows = lagged[lagged['has_next'].to_numpy()]
+    features = [col for col in NEXT_SEASON_FEATURES if col in rows.columns]
+    X = rows[features].apply(pd.to_numeric, errors='coerce').fillna(0).to_numpy(dtype=float)
+    y_goals = rows['next_Gls'].to_numpy(dtype=float)
+    y_assists = rows['next_Ast'].to_numpy(dtype=float)
+    return X, np.nan_to_num(y_goals), np.nan_to_num(y_assists), features
+
+# Model artifact: one versioned bundle holding both compiled forests
+MODELS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "models")
+BUNDLE_PATH = os.path.join(MODELS_DIR, "model_bundle.joblib")
+BUNDLE_FORMAT_VERSION = 1
+
+# Column order of the feature matrix the forests were trained on
+FEATURE_SCHEMA = ["goals", "assists", "minutes_played", "age"]
+
+# Files written by older versions, converted to a bundle on first load
+LEGACY_PICKLES = {"perf": "perf_model.pkl", "value": "value_model.pkl", "scaler": "scaler.pkl"}
+
+# Training-only state for incremental updates (never read by the predictor):
+# per-row feature cache keyed by (PlayerID, Season) and the fitted estimators
+TRAIN_DIR = os.path.join(MODELS_DIR, ".train")
+FEATURE_CACHE_PATH = os.path.join(TRAIN_DIR, "feature_cache.npz")
+TRAIN_STATE_PATH = os.path.join(TRAIN_DIR, "train_state.joblib")
+
+# Incremental updates add at least this many trees, cap the forest size
+# (dropping the oldest trees) and fall back to a full refit above this delta
+MIN_TREES_PER_UPDATE = 10
+MAX_ESTIMATORS = 200
+FULL_REFIT_FRACTION = 0.5
+
+def export_forest(model, scaler):
+    """
+    Flatten a fitted RandomForestRegressor into packed NumPy arrays.
+
+    All trees are concatenated into one node table (feature, threshold,
+    left/right child, leaf value) with global child indices; leaves point to
+    themselves so every row can be walked for a fixed number of steps. The
+    StandardScaler is folded into the thresholds, so the compiled forest
+    takes raw (unscaled) features.
+    """
+    trees = [estimator.tree_ for estimator in model.estimators_]
+    node_counts = np.array([tree.node_count for tree in trees])
+    roots = np.concatenate([[0], np.cumsum(node_counts)[:-1]])
+
+    feature, threshold, left, right, value = [], [], [], [], []
+    for root, tree in zip(roots, trees):
+        node_ids = np.arange(tree.node_count) + root
+        is_leaf = tree.children_left == -1
+        tree_feature = np.where(is_leaf, 0, tree.feature)
+        # sklearn compares float32(x_scaled) <= t, which holds exactly when x_scaled is
+        # below the rounding boundary between the largest float32 <= t and its successor
+        t32 = tree.threshold.astype(np.float32)
+        t32 = np.where(t32 > tree.threshold, np.nextafter(t32, np.float32(-np.inf)), t32)
+        boundary = (t32.astype(np.float64) + np.nextafter(t32, np.float32(np.inf)).astype(np.float64)) / 2
+        # x_scaled <= boundary  <=>  x <= boundary * scale + mean
+        tree_threshold = boundary * scaler.scale_[tree_feature] + scaler.mean_[tree_feature]
+        feature.append(tree_feature)
+        threshold.append(np.where(is_leaf, np.inf, tree_threshold))
+        left.append(np.where(is_leaf, node_ids, tree.children_left + root))
+        right.append(np.where(is_leaf, node_ids, tree.children_right + root))
+        value.append(tree.value[:, 0, 0])
+
+    return {
+        "feature": np.concatenate(feature).astype(np.int32),
+        "threshold": np.concatenate(threshold).astype(np.float64),
+        "left": np.concatenate(left).astype(np.int32),
+        "right": np.concatenate(right).astype(np.int32),
+        "value": np.concatenate(value).astype(np.float64),
+        "roots": roots.astype(np.int32),
+        "max_depth": np.int32(max(tree.max_depth for tree in trees)),
+        # identifies the scaler folded into the thresholds above
+        "scaler_fingerprint": _scaler_fingerprint(scaler.mean_, scaler.scale_)
+    }
+
+def training_data_hash(X, y_perf, y_value):
+    """SHA-256 of the training matrix and targets"""
+    digest = hashlib.sha256()
+    for array in (X, y_perf, y_value):
+        digest.update(np.ascontiguousarray(array, dtype=np.float64).tobytes())
+    return digest.hexdigest()
+
+def _scaler_fingerprint(mean, scale):
+    """Short hash identifying StandardScaler parameters"""
+    digest = hashlib.sha256()
+    digest.update(np.asarray(mean, dtype=np.float64).tobytes())
+    digest.update(np.asarray(scale, dtype=np.float64).tobytes())
+    return digest.hexdigest()[:16]
+
+def save_model_bundle(perf_model, value_model, scaler, data_hash, metrics=None, n_samples=None, path=BUNDLE_PATH):
+    """
+    Write both models as one versioned bundle.
+
+    The bundle is a joblib file of plain NumPy arrays (no estimator
+    objects): the compiled forests with the scaler folded in, the scaler
+    parameters, and a JSON manifest with the feature schema, training-data
+    hash (null for bundles converted from legacy pickles) and metrics. Every forest records the fingerprint of the scaler
+    export_forest folded into it; load_model_bundle checks those against the
+    stored scaler parameters, so a mismatched scaler can never be used silently.
+    """
+    import joblib
+    import sklearn
+
+    fingerprint = _scaler_fingerprint(scaler.mean_, scaler.scale_)
+    manifest = {
+        "format_version": BUNDLE_FORMAT_VERSION,
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "sklearn_version": sklearn.__version__,
+        "feature_schema": FEATURE_SCHEMA,
+        "training_data_hash": data_hash,
+        "n_samples": n_samples,
+        "metrics": metrics or {},
+        "scaler_fingerprint": fingerprint,
+        "models": {
+            name: {"n_estimators": len(model.estimators_), "max_depth": model.max_depth}
+            for name, model in (("perf", perf_model), ("value", value_model))
+        },
+    }
+    forests = {}
+    for name, model in (("perf", perf_model), ("value", value_model)):
+        forests[name] = export_forest(model, scaler)
+    bundle = {
+        "manifest": json.dumps(manifest),
+        "scaler": {"mean": np.asarray(scaler.mean_), "scale": np.asarray(scaler.scale_)},
+        "forests": forests,
+    }
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    # uncompressed, so the arrays can be memory-mapped on load
+    tmp_path = f"{path}.tmp-{os.getpid()}"
+    joblib.dump(bundle, tmp_path)
+    os.replace(tmp_path, path)
+    return manifest
+
+def load_model_bundle(path=BUNDLE_PATH, mmap=True):
+    """
+    Load a model bundle as (manifest, {"perf": arrays, "value": arrays}).
+
+    Arrays are memory-mapped read-only by default, so processes sharing the
+    same bundle share its pages. Returns None if the file does not exist;
+    raises ValueError if the bundle is from another format version, was
+    trained on a different feature schema, or its forests and scaler don't match.
+    """
+    import joblib
+
+    if not os.path.exists(path):
+        return None
+    bundle = joblib.load(path, mmap_mode="r" if mmap else None)
+    manifest = json.loads(bundle["manifest"])
+    if manifest.get("format_version") != BUNDLE_FORMAT_VERSION:
+        raise ValueError(f"unsupported model bundle version {manifest.get('format_version')}")
+    if manifest.get("feature_schema") != FEATURE_SCHEMA:
+        raise ValueError(f"model bundle was trained on features {manifest.get('feature_schema')}")
+    # the stored scaler must be the one recorded in the manifest and folded into both forests
+    fingerprint = _scaler_fingerprint(bundle["scaler"]["mean"], bundle["scaler"]["scale"])
+    if manifest.get("scaler_fingerprint") != fingerprint:
+        raise ValueError("model bundle scaler does not match its manifest")
+    forests = bundle["forests"]
+    for name in ("perf", "value"):
+        if str(forests[name]["scaler_fingerprint"]) != fingerprint:
+            raise ValueError(f"{name} model was compiled with a different scaler")
+    return manifest, forests
+
+def _migrate_legacy_pickles():
+    """
+    Convert perf_model.pkl / value_model.pkl / scaler.pkl into a bundle; False if they don't exist.
+    The data the pickles were trained on is unknown, so the bundle records no
+    training-data hash or sample count (hashing today's CSVs would claim otherwise).
+    """
+    paths = {name: os.path.join(MODELS_DIR, filename) for name, filename in LEGACY_PICKLES.items()}
+    if not all(os.path.exists(path) for path in paths.values()):
+        return False
+    print("Converting pickled models to a model bundle...")
+    loaded = {}
+    for name, path in paths.items():
+        with open(path, "rb") as f:
+            loaded[name] = pickle.load(f)
+    save_model_bundle(
+        loaded["perf"], loaded["value"], loaded["scaler"],
+        None, metrics=None, n_samples=None
+    )
+    return True
+
+# Forest hyperparameters used unless model selection picked others
+DEFAULT_FOREST_PARAMS = {"n_estimators": 100, "max_depth": 10}
+
+def train_models(params=None, save=True):
+    """
+    Train ML models for performance and value prediction
+
+    Args:
+        params: Optional {"perf": {...}, "value": {...}} RandomForestRegressor
+            hyperparameters (e.g. the best ones from model_selection)
+        save: Write the model bundle and training state (False for benchmarks)
+    """
+    params = params or {}
+    # Training-only dependencies are imported here so that loading the
+    # predictor (and the GUI) does not pay for importing sklearn
+    from sklearn.ensemble import RandomForestRegressor
+    from sklearn.model_selection import train_test_split
+    from sklearn.preprocessing import StandardScaler
+    from sklearn.metrics import mean_absolute_error, r2_score
 
-def train_models():
-    """Train ML models for performance and value prediction"""
     print("Loading and preparing data...")
-    X, y_perf, y_value = prepare_data()
+    rows = load_training_rows()
+    valid, X_all, y_perf_all, y_value_all = build_training_arrays(rows)
+    X, y_perf, y_value = X_all[valid], y_perf_all[valid], y_value_all[valid]
     
     if len(X) == 0:
         raise ValueError("No valid data found in CSV files")
@@ -133,7 +451,9 @@ def train_models():
     
     # Train performance prediction model
     print("Training performance prediction model...")
-    perf_model = RandomForestRegressor(n_estimators=100, max_depth=10, random_state=42, n_jobs=-1)
+    perf_model = RandomForestRegressor(
+        **{**DEFAULT_FOREST_PARAMS, **params.get("perf", {})}, random_state=42, n_jobs=-1
+    )
     perf_model.fit(X_train_scaled, y_perf_train)
     
     perf_pred = perf_model.predict(X_test_scaled)
@@ -143,7 +463,9 @@ def train_models():
     
     # Train value prediction model
     print("Training market value prediction model...")
-    value_model = RandomForestRegressor(n_estimators=100, max_depth=10, random_state=42, n_jobs=-1)
+    value_model = RandomForestRegressor(
+        **{**DEFAULT_FOREST_PARAMS, **params.get("value", {})}, random_state=42, n_jobs=-1
+    )
     value_model.fit(X_train_scaled, y_value_train)
     
     value_pred = value_model.predict(X_test_scaled)
@@ -151,45 +473,216 @@ def train_models():
     value_r2 = r2_score(y_value_test, value_pred)
     print(f"Value Model - MAE: ${value_mae:.2f}M, R²: {value_r2:.3f}")
     
-    # Save models and scaler
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    ve_dir = os.path.dirname(script_dir)
-    models_dir = os.path.join(ve_dir, "models")
-    os.makedirs(models_dir, exist_ok=True)
-    
-    with open(os.path.join(models_dir, "perf_model.pkl"), "wb") as f:
-        pickle.dump(perf_model, f)
-    
-    with open(os.path.join(models_dir, "value_model.pkl"), "wb") as f:
-        pickle.dump(value_model, f)
+    if not save:
+        return perf_model, value_model, scaler
+
+    # Save both models as one versioned bundle
+    metrics = {
+        "perf": {"mae": float(perf_mae), "r2": float(perf_r2)},
+        "value": {"mae": float(value_mae), "r2": float(value_r2)},
+    }
+    save_model_bundle(
+        perf_model, value_model, scaler,
+        training_data_hash(X, y_perf, y_value), metrics=metrics, n_samples=len(X)
+    )
     
-    with open(os.path.join(models_dir, "scaler.pkl"), "wb") as f:
-        pickle.dump(scaler, f)
+    # Remember per-row features and the estimators for incremental updates
+    _save_training_state(rows, valid, X_all, y_perf_all, y_value_all, perf_model, value_model, scaler)
     
-    print(f"Models saved to {models_dir}")
+    print(f"Models saved to {BUNDLE_PATH}")
     return perf_model, value_model, scaler
 
-def load_models():
-    """Load trained models"""
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    ve_dir = os.path.dirname(script_dir)
-    models_dir = os.path.join(ve_dir, "models")
-    
+def _row_keys(rows):
+    """
+    'PlayerID|Season|n' key of every training row; n numbers repeated
+    (PlayerID, Season) pairs so the keys stay unique
+    """
+    occurrence = rows.groupby(KEY_COLUMNS, sort=False, dropna=False).cumcount()
+    return (
+        rows['PlayerID'].astype(str) + "|" + rows['Season'].astype(str) + "|" + occurrence.astype(str)
+    ).to_numpy(dtype=str)
+
+def _row_hashes(rows):
+    """Content hash of the training columns of every row"""
+    columns = [col for col in TRAINING_COLUMNS if col in rows.columns]
+    return pd.util.hash_pandas_object(rows[columns], index=False).to_numpy()
+
+def _save_training_state(rows, valid, X, y_perf, y_value, perf_model, value_model, scaler, trees_grown=None):
+    import joblib
+
+    if not all(col in rows.columns for col in KEY_COLUMNS):
+        return
+    os.makedirs(TRAIN_DIR, exist_ok=True)
+    tmp_path = f"{FEATURE_CACHE_PATH}.tmp-{os.getpid()}.npz"
+    np.savez(
+        tmp_path, keys=_row_keys(rows), hashes=_row_hashes(rows),
+        valid=valid, X=X, y_perf=y_perf, y_value=y_value
+    )
+    os.replace(tmp_path, FEATURE_CACHE_PATH)
+    tmp_path = f"{TRAIN_STATE_PATH}.tmp-{os.getpid()}"
+    state = {
+        "perf": perf_model, "value": value_model, "scaler": scaler,
+        # trees fit so far, including ones dropped beyond MAX_ESTIMATORS (seeds the next update)
+        "trees_grown": len(perf_model.estimators_) if trees_grown is None else trees_grown,
+    }
+    joblib.dump(state, tmp_path)
+    os.replace(tmp_path, TRAIN_STATE_PATH)
+
+def _load_training_state():
+    """(feature cache dict, estimators dict) from the last training run, or None"""
+    import joblib
+
     try:
-        with open(os.path.join(models_dir, "perf_model.pkl"), "rb") as f:
-            perf_model = pickle.load(f)
-        
-        with open(os.path.join(models_dir, "value_model.pkl"), "rb") as f:
-            value_model = pickle.load(f)
-        
-        with open(os.path.join(models_dir, "scaler.pkl"), "rb") as f:
-            scaler = pickle.load(f)
-        
-        return perf_model, value_model, scaler
-    except FileNotFoundError:
-        print("Models not found. Training new models...")
+        with np.load(FEATURE_CACHE_PATH, allow_pickle=False) as data:
+            cache = {key: data[key] for key in data.files}
+        state = joblib.load(TRAIN_STATE_PATH)
+    except (OSError, KeyError, ValueError):
+        return None
+    return cache, state
+
+def train_incremental():
+    """
+    Update the models for rows that are new or changed since the last run.
+
+    Rows are identified by (PlayerID, Season) (and their order among
+    repeats of that pair) and compared by a hash of
+    their training columns. Features of unchanged rows come from the
+    feature cache; only the delta goes through engineer_features. The
+    forests then grow with warm_start: the new trees (more for a larger
+    delta) are fit on the updated data, and the oldest trees are dropped
+    beyond MAX_ESTIMATORS. The scaler is kept so existing trees stay valid.
+    Falls back to train_models() without previous state or when more than
+    FULL_REFIT_FRACTION of the rows changed.
+    """
+    loaded = _load_training_state()
+    if loaded is None:
+        print("No previous training state. Running full training...")
+        return train_models()
+    cache, state = loaded
+
+    print("Loading and diffing data...")
+    rows = load_training_rows()
+    keys, hashes = _row_keys(rows), _row_hashes(rows)
+    cached = pd.Index(cache["keys"]).get_indexer(keys)
+    unchanged = cached >= 0
+    unchanged[unchanged] = cache["hashes"][cached[unchanged]] == hashes[unchanged]
+    delta = ~unchanged
+    n_delta = int(delta.sum())
+    if n_delta == 0:
+        print("No new or changed rows; models are up to date.")
+        return state["perf"], state["value"], state["scaler"]
+    if n_delta > FULL_REFIT_FRACTION * len(rows):
+        print(f"{n_delta} of {len(rows)} rows changed. Running full training...")
         return train_models()
 
+    # cached features for unchanged rows, engineered features for the delta
+    valid = np.zeros(len(rows), dtype=bool)
+    X = np.zeros((len(rows), cache["X"].shape[1]))
+    y_perf = np.zeros(len(rows))
+    y_value = np.zeros(len(rows))
+    src = cached[unchanged]
+    valid[unchanged], X[unchanged] = cache["valid"][src], cache["X"][src]
+    y_perf[unchanged], y_value[unchanged] = cache["y_perf"][src], cache["y_value"][src]
+    valid[delta], X[delta], y_perf[delta], y_value[delta] = build_training_arrays(rows[delta])
+
+    perf_model, value_model, scaler = state["perf"], state["value"], state["scaler"]
+    trees_grown = state.get("trees_grown", len(perf_model.estimators_))
+    X_scaled = scaler.transform(X[valid])
+    n_new = max(MIN_TREES_PER_UPDATE, math.ceil(len(perf_model.estimators_) * n_delta / len(rows)))
+    print(f"{n_delta} new or changed rows. Adding {n_new} trees per model...")
+    for model, y in ((perf_model, y_perf), (value_model, y_value)):
+        # warm_start skips one seed per tree still in the forest; once old trees are
+        # dropped that would replay seeds of kept trees, so every update gets its own stream
+        model.set_params(
+            warm_start=True, n_estimators=len(model.estimators_) + n_new, random_state=42 + trees_grown
+        )
+        model.fit(X_scaled, y[valid])
+        if len(model.estimators_) > MAX_ESTIMATORS:
+            model.estimators_ = model.estimators_[-MAX_ESTIMATORS:]
+            model.set_params(n_estimators=MAX_ESTIMATORS)
+
+    previous = load_model_bundle()
+    metrics = dict(previous[0].get("metrics", {})) if previous is not None else {}
+    metrics["last_update"] = {
+        "mode": "incremental",
+        "delta_rows": n_delta,
+        "trees_added": n_new,
+        "n_estimators": len(perf_model.estimators_),
+    }
+    save_model_bundle(
+        perf_model, value_model, scaler,
+        training_data_hash(X[valid], y_perf[valid], y_value[valid]),
+        metrics=metrics, n_samples=int(valid.sum())
+    )
+    _save_training_state(
+        rows, valid, X, y_perf, y_value, perf_model, value_model, scaler, trees_grown=trees_grown + n_new
+    )
+    print(f"Models saved to {BUNDLE_PATH}")
+    return perf_model, value_model, scaler
+
+# Background build of a missing model bundle (one per process)
+_BACKGROUND_TRAINING = None
+_BACKGROUND_LOCK = threading.Lock()
+
+# After a failed background build, wait this long (doubling per failure) before retrying
+RETRY_BACKOFF_S = 60.0
+MAX_RETRY_BACKOFF_S = 3600.0
+_BACKGROUND_FAILURES = 0
+_RETRY_AFTER = 0.0
+
+def start_background_training():
+    """
+    Create the model bundle in a daemon thread (at most one at a time); returns
+    the thread. A failed build is retried by a later call once its backoff has passed.
+    """
+    global _BACKGROUND_TRAINING
+
+    def run():
+        global _BACKGROUND_FAILURES, _RETRY_AFTER
+        try:
+            if not _migrate_legacy_pickles():
+                train_models()
+        except Exception as e:
+            with _BACKGROUND_LOCK:
+                backoff = min(RETRY_BACKOFF_S * 2 ** _BACKGROUND_FAILURES, MAX_RETRY_BACKOFF_S)
+                _BACKGROUND_FAILURES += 1
+                _RETRY_AFTER = time.monotonic() + backoff
+            print(f"Error during background training: {e} (retrying in {backoff:.0f}s)")
+
+    with _BACKGROUND_LOCK:
+        previous = _BACKGROUND_TRAINING
+        retry = (
+            previous is not None and not previous.is_alive()
+            and _BACKGROUND_FAILURES > 0 and time.monotonic() >= _RETRY_AFTER
+        )
+        if previous is None or retry:
+            print("Models not found. Training in background; using fallback predictions meanwhile...")
+            _BACKGROUND_TRAINING = threading.Thread(target=run, name="model-training", daemon=True)
+            _BACKGROUND_TRAINING.start()
+        return _BACKGROUND_TRAINING
+
+def load_models(background=False):
+    """
+    Load the model bundle as (manifest, forests).
+    Converts legacy pickles, or trains new models, if there is no bundle yet.
+    With background=True that work runs in a background thread and None is
+    returned until the bundle exists.
+    """
+    loaded = load_model_bundle()
+    if loaded is None:
+        if background:
+            start_background_training()
+            return None
+        if not _migrate_legacy_pickles():
+            print("Models not found. Training new models...")
+            train_models()
+        loaded = load_model_bundle()
+    return loaded
+
 if __name__ == "__main__":
-    train_models()
+    import sys
+    if "--incremental" in sys.argv[1:]:
+        train_incremental()
+    else:
+        train_models()
 
@@ -0,0 +1,142 @@
+"""
+Columnar on-disk player store
+Converts each source CSV once into typed per-column NumPy files so loaders
+can memory-map only the columns they need instead of re-parsing the CSV
+"""
+import hashlib
+import json
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+
+# Bump when the on-disk layout changes so old stores get rebuilt
+STORE_FORMAT_VERSION = 1
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+ve_dir = os.path.dirname(script_dir)
+STORE_DIR = os.path.join(ve_dir, "data", ".store")
+
+# Environment variable naming a CSV to use instead of data/Season.csv,
+# e.g. a file written by generate_data.py
+SEASON_CSV_ENV = "FOOTBALL_AI_SEASON_CSV"
+
+def source_csvs():
+    """Paths of the player CSVs every loader reads (All_Players.csv, then Season.csv)"""
+    return [
+        os.path.join(ve_dir, "data", "All_Players.csv"),
+        os.environ.get(SEASON_CSV_ENV) or os.path.join(ve_dir, "data", "Season.csv"),
+    ]
+
+def source_signature(csv_path):
+    """Hash of the source CSV's name, modification time and size"""
+    stat = os.stat(csv_path)
+    key = f"{STORE_FORMAT_VERSION}:{os.path.basename(csv_path)}:{stat.st_mtime_ns}:{stat.st_size}"
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+def _store_path(csv_path):
+    """Directory holding the converted columns of csv_path"""
+    name = os.path.splitext(os.path.basename(csv_path))[0]
+    return os.path.join(STORE_DIR, name)
+
+def _read_manifest(store_path):
+    try:
+        with open(os.path.join(store_path, "manifest.json"), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+
+def build_store(csv_path):
+    """
+    Parse csv_path once and write it as one .npy file per column.
+
+    Numeric columns are stored with their parsed dtype. Text columns are
+    stored as int32 codes (-1 for missing) plus a fixed-width unicode array
+    of categories, so nothing needs pickle and everything can be mmapped.
+
+    Returns:
+        The manifest dict of the new store
+    """
+    signature = source_signature(csv_path)
+    df = pd.read_csv(csv_path)
+
+    store_path = _store_path(csv_path)
+    tmp_path = f"{store_path}.tmp-{os.getpid()}"
+    shutil.rmtree(tmp_path, ignore_errors=True)
+    os.makedirs(tmp_path)
+
+    columns = []
+    for i, name in enumerate(df.columns):
+        file_stem = f"c{i:03d}"
+        series = df[name]
+        if series.dtype.kind in "biuf":
+            np.save(os.path.join(tmp_path, f"{file_stem}.npy"), series.to_numpy())
+            columns.append({"name": name, "kind": "numeric", "file": file_stem})
+        else:
+            codes, categories = pd.factorize(series)
+            np.save(os.path.join(tmp_path, f"{file_stem}.codes.npy"), codes.astype(np.int32))
+            np.save(
+                os.path.join(tmp_path, f"{file_stem}.categories.npy"),
+                np.asarray([str(c) for c in categories], dtype=str)
+            )
+            columns.append({"name": name, "kind": "text", "file": file_stem})
+
+    manifest = {
+        "format_version": STORE_FORMAT_VERSION,
+        "source": os.path.basename(csv_path),
+        "signature": signature,
+        "rows": len(df),
+        "columns": columns
+    }
+    with open(os.path.join(tmp_path, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+
+    # Swap the finished store into place
+    shutil.rmtree(store_path, ignore_errors=True)
+    os.replace(tmp_path, store_path)
+    return manifest
+
+def ensure_store(csv_path):
+    """Return the manifest of an up-to-date store, rebuilding it if the CSV changed"""
+    manifest = _read_manifest(_store_path(csv_path))
+    if manifest is None or manifest.get("signature") != source_signature(csv_path):
+        manifest = build_store(csv_path)
+    return manifest
+
+def _load_column(store_path, column):
+    """Load one stored column as a NumPy array"""
+    stem = os.path.join(store_path, column["file"])
+    if column["kind"] == "numeric":
+        return np.load(f"{stem}.npy", mmap_mode="r")
+
+    codes = np.load(f"{stem}.codes.npy", mmap_mode="r")
+    categories = np.load(f"{stem}.categories.npy").astype(object)
+    values = np.empty(len(codes), dtype=object)
+    present = codes >= 0
+    values[present] = categories[codes[present]]
+    values[~present] = np.nan
+    return values
+
+def read_table(csv_path, columns=None):
+    """
+    Read csv_path through the columnar store.
+
+    Args:
+        csv_path: Path of the source CSV
+        columns: Optional list of column names to load; columns that don't
+            exist in the CSV are skipped, like checking df.columns afterwards
+
+    Returns:
+        DataFrame equivalent to pd.read_csv(csv_path)[columns]
+    """
+    manifest = ensure_store(csv_path)
+    store_path = _store_path(csv_path)
+
+    stored = manifest["columns"]
+    if columns is not None:
+        wanted = set(columns)
+        stored = [c for c in stored if c["name"] in wanted]
+
+    data = {c["name"]: _load_column(store_path, c) for c in stored}
+    return pd.DataFrame(data, index=pd.RangeIndex(manifest["rows"]), columns=[c["name"] for c in stored])
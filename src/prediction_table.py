@@ -0,0 +1,195 @@
+# src/prediction_table.py
+"""
+Precomputed prediction table for the whole player database
+Scores every row of load_and_combine() once with predict_batch and stores
+the results next to the player store. The table is versioned by the source
+CSVs and the model files, so stale predictions are detected and rebuilt.
+"""
+import hashlib
+import os
+import threading
+import time
+import weakref
+
+import numpy as np
+import pandas as pd
+
+from .player_store import STORE_DIR, source_signature, source_csvs
+from . import predictor
+from .model_trainer import BUNDLE_PATH
+from .data_loader import on_reload
+
+TABLE_FORMAT_VERSION = 1
+
+TABLE_PATH = os.path.join(STORE_DIR, "predictions.npz")
+
+# Inputs the stored predictions depend on (the CSVs come from source_csvs())
+MODEL_FILES = [BUNDLE_PATH]
+
+# Seconds between re-signing the CSVs and the model bundle in is_stale()
+STALE_CHECK_INTERVAL = 5.0
+
+PREDICTION_COLUMNS = ["predicted_goals", "predicted_assists", "performance_score", "market_value"]
+
+def _model_signature():
+    """mtime/size of the model bundle, or 'heuristic' when the fallback is in use"""
+    if not predictor.MODELS_LOADED:
+        return "heuristic"
+    parts = []
+    for path in MODEL_FILES:
+        try:
+            stat = os.stat(path)
+            parts.append(f"{os.path.basename(path)}:{stat.st_mtime_ns}:{stat.st_size}")
+        except OSError:
+            parts.append(f"{os.path.basename(path)}:missing")
+    return ";".join(parts)
+
+def current_version():
+    """Version string for predictions made from the current CSVs and models"""
+    predictor._ensure_models_loaded()
+    key = ";".join(
+        [str(TABLE_FORMAT_VERSION)]
+        + [source_signature(path) for path in source_csvs()]
+        + [_model_signature()]
+    )
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+class PredictionTable:
+    """
+    Stored predictions for every player row, looked up by DataFrame index label.
+    When the inputs change (or the data is reloaded) the table rebuilds itself
+    in a background thread; it reports stale until the new predictions are in.
+    """
+
+    def __init__(self, predictions: pd.DataFrame, version: str, df: pd.DataFrame = None):
+        self._frame = weakref.ref(df) if df is not None else None
+        self._lock = threading.Lock()
+        self._refreshing = None
+        self._set(predictions, version)
+
+    def _set(self, predictions, version):
+        rows = {label: pos for pos, label in enumerate(predictions.index)}
+        values = predictions[PREDICTION_COLUMNS].to_numpy(dtype=float)
+        # swapped as one tuple so readers never see half of a rebuild
+        self._state = (predictions, version, rows, values)
+        self._stale = False
+        self._checked_at = time.monotonic()
+
+    @property
+    def predictions(self):
+        return self._state[0]
+
+    @property
+    def version(self):
+        return self._state[1]
+
+    def is_stale(self, df=None):
+        """
+        True if the CSVs or models changed since the table was built, while
+        it is being rebuilt, or if df is given and is not the frame it scores.
+        Checked at most every STALE_CHECK_INTERVAL seconds (it stats and
+        signs every input); a stale table starts a background rebuild.
+        """
+        if df is not None and (self._frame is None or self._frame() is not df):
+            return True
+        now = time.monotonic()
+        if self._stale or now - self._checked_at < STALE_CHECK_INTERVAL:
+            return self._stale
+        self._checked_at = now
+        try:
+            self._stale = self.version != current_version()
+        except OSError:
+            self._stale = True
+        if self._stale:
+            self.refresh()
+        return self._stale
+
+    def refresh(self, df=None):
+        """
+        Rebuild (and save) the table in a background thread, for df if given
+        (e.g. after a reload), otherwise for the frame it was built for.
+        Returns the thread, or None if there is no frame to score.
+        """
+        with self._lock:
+            if df is not None:
+                self._frame = weakref.ref(df)
+                self._stale = True
+            if self._refreshing is not None and self._refreshing.is_alive():
+                return self._refreshing
+            frame = self._frame() if self._frame is not None else None
+            if frame is None:
+                return None
+
+            def run():
+                try:
+                    table = build_prediction_table(frame)
+                except Exception as e:
+                    print(f"Error rebuilding the prediction table: {e}")
+                    return
+                with self._lock:
+                    # a reload during the rebuild retargets the table; leave it stale for that
+                    if self._frame() is frame:
+                        self._set(table.predictions, table.version)
+
+            self._refreshing = threading.Thread(target=run, name="prediction-table", daemon=True)
+            self._refreshing.start()
+            return self._refreshing
+
+    def lookup(self, label):
+        """Prediction dict for a player row label, or None if unknown"""
+        _, _, rows, values = self._state
+        pos = rows.get(label)
+        if pos is None:
+            return None
+        return {col: float(v) for col, v in zip(PREDICTION_COLUMNS, values[pos])}
+
+    def lookup_row(self, player_row):
+        """Prediction dict for a player row (pandas Series), or None"""
+        return self.lookup(getattr(player_row, "name", None))
+
+# Tables handed out by load_prediction_table; rebuilt for the new frame on every reload
+_LIVE_TABLES = weakref.WeakSet()
+
+def _on_data_reload(df):
+    for table in list(_LIVE_TABLES):
+        table.refresh(df)
+
+on_reload(_on_data_reload)
+
+def build_prediction_table(df: pd.DataFrame, save=True):
+    """Score every row of df and (optionally) store the table on disk"""
+    version = current_version()
+    predictions = predictor.predict_batch(df)
+    if save:
+        os.makedirs(STORE_DIR, exist_ok=True)
+        tmp_path = f"{TABLE_PATH}.tmp-{os.getpid()}.npz"
+        np.savez(
+            tmp_path,
+            version=np.array(version),
+            index=df.index.to_numpy(dtype=np.int64),
+            **{col: predictions[col].to_numpy(dtype=float) for col in PREDICTION_COLUMNS}
+        )
+        os.replace(tmp_path, TABLE_PATH)
+    return PredictionTable(predictions, version, df)
+
+def load_prediction_table(df: pd.DataFrame):
+    """
+    Prediction table for df: the stored one if it is current and covers
+    df's rows, otherwise a freshly scored (and saved) one.
+    """
+    version = current_version()
+    table = None
+    try:
+        with np.load(TABLE_PATH, allow_pickle=False) as data:
+            if str(data["version"]) == version and np.array_equal(data["index"], df.index.to_numpy()):
+                predictions = pd.DataFrame(
+                    {col: data[col] for col in PREDICTION_COLUMNS},
+                    index=pd.Index(data["index"])
+                )
+                table = PredictionTable(predictions, version, df)
+    except (OSError, KeyError, ValueError):
+        pass
+    if table is None:
+        table = build_prediction_table(df)
+    _LIVE_TABLES.add(table)
+    return table
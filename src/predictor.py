@@ -3,153 +3,259 @@ ML-based Predictor for Football Player Performance and Market Value
 Uses trained Random Forest models to make predictions
 """
 import numpy as np
-import os
-import sys
-
-# Add parent directory to path for imports
-script_dir = os.path.dirname(os.path.abspath(__file__))
-if script_dir not in sys.path:
-    sys.path.insert(0, script_dir)
-
-try:
-    from model_trainer import load_models, safe_convert
-except ImportError:
-    # Fallback if relative import doesn't work
-    import model_trainer
-    load_models = model_trainer.load_models
-    safe_convert = model_trainer.safe_convert
+import pandas as pd
+import threading
+
+# Package-relative, so the app, server and trainer share one model_trainer
+# (and its once-only background training state)
+from .model_trainer import load_models, safe_convert
+from .utils import is_missing
+from .cache import LRUCache
 
 # Load models once at module import (lazy loading)
-PERF_MODEL = None
-VALUE_MODEL = None
-SCALER = None
 MODELS_LOADED = False
 
+# Compiled forests from the model bundle (see model_trainer.save_model_bundle)
+PERF_FOREST = None
+VALUE_FOREST = None
+MODEL_MANIFEST = None
+
+# (goals, assists, minutes played, age) -> prediction dict; cleared when models load
+PREDICTION_CACHE = LRUCache(maxsize=1024)
+
+# Serializes the first load when the GUI prewarms while a request comes in
+_LOAD_LOCK = threading.Lock()
+
 def _ensure_models_loaded():
-    """Lazy load models when needed"""
-    global PERF_MODEL, VALUE_MODEL, SCALER, MODELS_LOADED
-    if not MODELS_LOADED:
+    """
+    Lazy load models when needed (thread-safe).
+    Reads the memory-mapped model bundle; needs neither sklearn nor
+    unpickling of estimators. Until a missing bundle has been trained in the
+    background, MODELS_LOADED stays False and the fallback is used.
+    """
+    global MODELS_LOADED, PERF_FOREST, VALUE_FOREST, MODEL_MANIFEST
+    if MODELS_LOADED:
+        return
+    with _LOAD_LOCK:
+        if MODELS_LOADED:
+            return
         try:
-            PERF_MODEL, VALUE_MODEL, SCALER = load_models()
+            # A missing bundle is built in the background; the fallback serves meanwhile
+            loaded = load_models(background=True)
+            if loaded is None:
+                return
+            MODEL_MANIFEST, forests = loaded
+            PERF_FOREST, VALUE_FOREST = CompiledForest(forests["perf"]), CompiledForest(forests["value"])
+            PREDICTION_CACHE.clear()
             MODELS_LOADED = True
         except Exception as e:
             print(f"Warning: Could not load models: {e}")
             print("Using fallback prediction methods")
             MODELS_LOADED = False
-            PERF_MODEL = VALUE_MODEL = SCALER = None
+            PERF_FOREST = VALUE_FOREST = MODEL_MANIFEST = None
 
-def predict_from_input(goals, assists, minutes_played, age):
+class CompiledForest:
     """
-    Predict performance and market value from direct input values.
-    
+    Vectorized evaluator for a forest flattened by model_trainer.export_forest.
+    Walks every (row, tree) pair one level per step with flat 1-D gathers and
+    averages the leaf values, taking raw features (the scaler is folded into
+    the thresholds). Rows are processed in chunks so the working set of a
+    large batch stays in cache.
+    """
+
+    # rows per chunk; chunk_rows * n_trees (row, tree) pairs are walked at once
+    CHUNK_ROWS = 512
+
+    def __init__(self, arrays):
+        self.feature = np.asarray(arrays["feature"], dtype=np.intp)
+        self.threshold = np.asarray(arrays["threshold"], dtype=np.float64)
+        # children interleaved, so the next node is one gather: children[2 * node + go_right]
+        self.children = np.column_stack([arrays["left"], arrays["right"]]).astype(np.intp).ravel()
+        self.value = np.asarray(arrays["value"], dtype=np.float64)
+        self.roots = np.asarray(arrays["roots"], dtype=np.intp)
+        self.max_depth = int(arrays["max_depth"])
+
+    def predict(self, features):
+        features = np.ascontiguousarray(features, dtype=np.float64)
+        n_rows, n_features = features.shape
+        n_trees = len(self.roots)
+        result = np.empty(n_rows)
+        for start in range(0, n_rows, self.CHUNK_ROWS):
+            chunk = features[start:start + self.CHUNK_ROWS]
+            flat = chunk.ravel()
+            # one entry per (row, tree): the current node and the row's offset in flat
+            node = np.tile(self.roots, len(chunk))
+            row_offset = np.repeat(np.arange(len(chunk)) * n_features, n_trees)
+            for _ in range(self.max_depth):
+                go_right = flat[row_offset + self.feature[node]] > self.threshold[node]
+                node = self.children[2 * node + go_right]
+            result[start:start + len(chunk)] = self.value[node].reshape(len(chunk), n_trees).mean(axis=1)
+        return result
+
+def _predict_arrays(goals, assists, minutes_played, age):
+    """
+    Vectorized prediction core shared by the scalar and batch APIs.
+
     Args:
-        goals: Number of goals scored
-        assists: Number of assists
-        minutes_played: Total minutes played
-        age: Player age
-    
+        goals, assists, minutes_played, age: 1-D NumPy arrays of equal length
+            (already validated and clipped)
+
     Returns:
-        dict with 'performance' and 'market_value' predictions
+        dict of NumPy arrays with the same keys as predict_from_input
     """
-    # Validate inputs
-    goals = max(0, float(goals))
-    assists = max(0, float(assists))
-    minutes_played = max(0, float(minutes_played))
-    age = max(16, min(50, float(age)))
-    
     # Ensure models are loaded
     _ensure_models_loaded()
-    
-    # Prepare feature vector
-    features = np.array([[goals, assists, minutes_played, age]])
-    
-    if MODELS_LOADED and SCALER is not None:
-        # Use ML models
-        features_scaled = SCALER.transform(features)
-        
-        # Predict performance (next match contribution score)
-        perf_score = PERF_MODEL.predict(features_scaled)[0]
-        
-        # Convert performance score to goals and assists estimate
-        # Performance score represents combined contribution
-        # Distribute based on input ratio
-        total_contribution = goals + assists * 0.8
-        if total_contribution > 0:
-            goals_ratio = goals / total_contribution
-            assists_ratio = (assists * 0.8) / total_contribution
-        else:
-            goals_ratio = 0.5
-            assists_ratio = 0.5
-        
+
+    # Distribute the performance score based on the input ratio
+    total_contribution = goals + assists * 0.8
+    has_contribution = total_contribution > 0
+    safe_total = np.where(has_contribution, total_contribution, 1.0)
+    goals_ratio = np.where(has_contribution, goals / safe_total, 0.5)
+    assists_ratio = np.where(has_contribution, (assists * 0.8) / safe_total, 0.5)
+
+    if MODELS_LOADED:
+        # Use ML models: one predict per model for the whole matrix
+        # (compiled forests take raw features, the scaler is folded in)
+        features = np.column_stack([goals, assists, minutes_played, age])
+        perf_score = PERF_FOREST.predict(features)
+        value_pred = VALUE_FOREST.predict(features)
+
         # Scale to per-match estimate (assuming ~30-40 matches per season)
-        matches_estimate = max(1, minutes_played / 90)
-        per_match_perf = perf_score / max(1, matches_estimate / 35)
-        
-        predicted_goals = max(0, round(per_match_perf * goals_ratio, 1))
-        predicted_assists = max(0, round(per_match_perf * assists_ratio * 1.25, 1))
-        
+        matches_estimate = np.maximum(1, minutes_played / 90)
+        per_match_perf = perf_score / np.maximum(1, matches_estimate / 35)
+
         # Predict market value
-        market_value = VALUE_MODEL.predict(features_scaled)[0]
-        market_value = max(0.1, market_value)
+        market_value = np.maximum(0.1, value_pred)
     else:
         # Fallback prediction
         base_performance = goals + assists * 0.8
-        if 23 <= age <= 28:
-            age_multiplier = 1.1
-        elif age < 23:
-            age_multiplier = 0.95 + (age - 18) * 0.03
-        else:
-            age_multiplier = 1.0 - (age - 28) * 0.02
-        
-        time_factor = 1.0 if minutes_played > 2000 else (0.9 if minutes_played > 1000 else 0.7)
+        age_multiplier = np.select(
+            [(age >= 23) & (age <= 28), age < 23],
+            [1.1, 0.95 + (age - 18) * 0.03],
+            default=1.0 - (age - 28) * 0.02
+        )
+        time_factor = np.select(
+            [minutes_played > 2000, minutes_played > 1000],
+            [1.0, 0.9],
+            default=0.7
+        )
         per_match_perf = base_performance * age_multiplier * time_factor * 0.15
-        
-        total_contribution = goals + assists * 0.8
-        if total_contribution > 0:
-            goals_ratio = goals / total_contribution
-            assists_ratio = (assists * 0.8) / total_contribution
-        else:
-            goals_ratio = 0.5
-            assists_ratio = 0.5
-        
-        predicted_goals = max(0, round(per_match_perf * goals_ratio, 1))
-        predicted_assists = max(0, round(per_match_perf * assists_ratio * 1.25, 1))
-        
+
         # Fallback value calculation
         base_value = (goals * 2.5) + (assists * 1.8)
-        if age < 23:
-            age_value_factor = 1.3
-        elif age <= 28:
-            age_value_factor = 1.0
-        else:
-            age_value_factor = 0.6 - (age - 28) * 0.05
-        
-        consistency_factor = min(1.0, minutes_played / 2500)
-        market_value = (base_value * age_value_factor * consistency_factor) / 10
-        market_value = max(0.1, market_value)
-        
+        age_value_factor = np.select(
+            [age < 23, age <= 28],
+            [1.3, 1.0],
+            default=0.6 - (age - 28) * 0.05
+        )
+        consistency_factor = np.minimum(1.0, minutes_played / 2500)
+        market_value = np.maximum(0.1, (base_value * age_value_factor * consistency_factor) / 10)
+
         # Set perf_score for return
         perf_score = per_match_perf
-    
+
+    predicted_goals = np.maximum(0, np.round(per_match_perf * goals_ratio, 1))
+    predicted_assists = np.maximum(0, np.round(per_match_perf * assists_ratio * 1.25, 1))
+
     return {
         "predicted_goals": predicted_goals,
         "predicted_assists": predicted_assists,
-        "performance_score": round(perf_score, 2),
+        "performance_score": np.round(perf_score, 2),
         "market_value": market_value
     }
 
-def predict_player_value(player_row):
+def predict_from_input(goals, assists, minutes_played, age):
     """
-    Predict market value from player data row.
-    Uses ML model if available, otherwise fallback.
+    Predict performance and market value from direct input values.
+    
+    Args:
+        goals: Number of goals scored
+        assists: Number of assists
+        minutes_played: Total minutes played
+        age: Player age
+    
+    Returns:
+        dict with 'performance' and 'market_value' predictions
     """
+    # Validate inputs
+    goals = max(0, float(goals))
+    assists = max(0, float(assists))
+    minutes_played = max(0, float(minutes_played))
+    age = max(16, min(50, float(age)))
+
+    result = _predict_arrays(
+        np.array([goals]), np.array([assists]), np.array([minutes_played]), np.array([age])
+    )
+    return {key: float(values[0]) for key, values in result.items()}
+
+def predict_features(features):
+    """
+    Predict for an (n, 4) array of raw [goals, assists, minutes played, age]
+    rows, validated and clipped the same way as predict_from_input.
+
+    Returns:
+        dict of NumPy arrays with the predict_from_input keys
+    """
+    features = np.asarray(features, dtype=float).reshape(-1, 4)
+    return _predict_arrays(
+        np.maximum(0, features[:, 0]),
+        np.maximum(0, features[:, 1]),
+        np.maximum(0, features[:, 2]),
+        np.clip(features[:, 3], 16, 50)
+    )
+
+def _numeric_column(df, column, default):
+    """Return a float column from df, coercing bad values to default"""
+    if column not in df.columns:
+        return np.full(len(df), float(default))
+    values = pd.to_numeric(df[column], errors="coerce")
+    return values.fillna(default).to_numpy(dtype=float)
+
+def predict_batch(df):
+    """
+    Predict performance and market value for every row of a player DataFrame.
+
+    Reads Gls/Ast/Min/Age straight from the DataFrame columns (falling back to
+    MP * 90 when Min is missing, like predict_player_value) and scores the
+    whole table with one pass per compiled forest; the forests take the raw
+    features, since the scaler is folded into their thresholds.
+
+    Args:
+        df: DataFrame of players, e.g. from load_and_combine()
+
+    Returns:
+        DataFrame indexed like df with predicted_goals, predicted_assists,
+        performance_score and market_value columns
+    """
+    if len(df) == 0:
+        return pd.DataFrame(
+            columns=["predicted_goals", "predicted_assists", "performance_score", "market_value"],
+            index=df.index, dtype=float
+        )
+
+    goals = np.maximum(0, _numeric_column(df, "Gls", 0))
+    assists = np.maximum(0, _numeric_column(df, "Ast", 0))
+    if "Min" in df.columns:
+        minutes_fallback = _numeric_column(df, "MP", 0) * 90
+        min_played = pd.to_numeric(df["Min"], errors="coerce").to_numpy(dtype=float)
+        min_played = np.where(np.isnan(min_played), minutes_fallback, min_played)
+    else:
+        min_played = _numeric_column(df, "MP", 0) * 90
+    minutes_played = np.maximum(0, min_played)
+    age = np.clip(_numeric_column(df, "Age", 25), 16, 50)
+
+    result = _predict_arrays(goals, assists, minutes_played, age)
+    return pd.DataFrame(result, index=df.index)
+
+def _row_features(player_row):
+    """Extract (goals, assists, minutes played, age) from a player data row"""
     def safe_get(key, default=0):
         try:
             if hasattr(player_row, 'get'):
                 val = player_row.get(key, default)
             else:
                 val = player_row[key] if key in player_row else default
-            if val is None or val == '':
+            if is_missing(val):
                 return default
             return float(val)
         except (ValueError, TypeError, KeyError):
@@ -160,34 +266,44 @@ def predict_player_value(player_row):
     minutes = safe_get("MP", 0) * 90  # Convert matches to minutes estimate
     min_played = safe_get("Min", minutes)
     age = safe_get("Age", 25)
-    
-    result = predict_from_input(goals, assists, min_played, age)
+    return goals, assists, min_played, age
+
+def predict_player(player_row):
+    """
+    Predict performance and market value from a player data row in one call.
+    Results are memoized per feature tuple until the models are reloaded.
+
+    Returns:
+        dict with the predict_from_input keys
+    """
+    features = _row_features(player_row)
+    result = PREDICTION_CACHE.get(features)
+    if result is None:
+        result = predict_from_input(*features)
+        PREDICTION_CACHE.put(features, result)
+    return dict(result)
+
+def prediction_cache_info():
+    """Hit/miss counters of the per-player prediction memo"""
+    return PREDICTION_CACHE.info()
+
+def format_market_value(result):
+    """Market value of a prediction result as display text, e.g. '$12.5M'"""
     return f"${round(result['market_value'], 2)}M"
 
+def predict_player_value(player_row):
+    """
+    Predict market value from player data row.
+    Uses ML model if available, otherwise fallback.
+    """
+    return format_market_value(predict_player(player_row))
+
 def predict_performance(player_row):
     """
     Predict next match performance from player data row.
     Uses ML model if available, otherwise fallback.
     """
-    def safe_get(key, default=0):
-        try:
-            if hasattr(player_row, 'get'):
-                val = player_row.get(key, default)
-            else:
-                val = player_row[key] if key in player_row else default
-            if val is None or val == '':
-                return default
-            return float(val)
-        except (ValueError, TypeError, KeyError):
-            return default
-
-    goals = safe_get("Gls", 0)
-    assists = safe_get("Ast", 0)
-    minutes = safe_get("MP", 0) * 90
-    min_played = safe_get("Min", minutes)
-    age = safe_get("Age", 25)
-    
-    result = predict_from_input(goals, assists, min_played, age)
+    result = predict_player(player_row)
     return {
         "predicted_goals": result["predicted_goals"],
         "predicted_assists": result["predicted_assists"]
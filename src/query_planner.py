@@ -0,0 +1,305 @@
+# src/query_planner.py
+"""
+Structured query planner for smart_search.
+A query is parsed once into a tree of typed predicates (combined with AND)
+plus an optional ranking, then evaluated as boolean masks over the typed
+player columns. Queries can therefore return several rows, e.g.
+"Barcelona defender under 25 with more than 3 goals".
+"""
+import re
+
+import numpy as np
+import pandas as pd
+
+from .utils import (
+    normalize_text,
+    fold_text,
+    COLUMN_MAPPING,
+    POSITION_SYNONYMS,
+    parse_comparison
+)
+from .search_index import Leaderboard, CategoricalIndex
+
+# Columns a number in the query can be compared against
+NUMERIC_COLUMNS = {"Gls", "Ast", "MP", "Age", "Value"}
+
+# Text columns matched against query words
+CATEGORY_COLUMNS = ["Squad", "League", "Nation"]
+
+# Comparison words that refer to age when no column keyword is given
+AGE_WORDS = ("younger than", "older than", "under", "over")
+
+# Words never matched against club/league/nation names on their own
+STOPWORDS = {
+    "with", "from", "than", "that", "who", "and", "the", "for", "in", "of", "at",
+    "player", "players", "team", "club", "squad", "nation", "country", "league"
+}
+
+# Similarity needed to take a 2-3 word phrase as a misspelt Squad/League/Nation name
+PHRASE_FUZZY_CUTOFF = 0.85
+
+# "top 5", "top 10" ...
+TOP_N_RE = re.compile(r"\btop (\d+)\b")
+
+# Words naming a numeric column ('goals', 'age' ...), plurals included
+NUMERIC_WORDS = sorted(
+    {word for word, col in COLUMN_MAPPING.items() if col in NUMERIC_COLUMNS}
+    | {word + "s" for word, col in COLUMN_MAPPING.items() if col in NUMERIC_COLUMNS and not word.endswith("s")},
+    key=len, reverse=True
+)
+
+# Words starting a comparison, never taken as the column word after a number
+OPERATOR_WORDS = "more|greater|less|fewer|younger|older|at|over|above|under|below"
+
+# [column word] [comparison] number [column word]; the trailing word is not
+# taken when a leading column word was found and it is followed by a number
+# ('goals 5 assists 3'), so it can start the next clause
+CLAUSE_RE = re.compile(
+    rf"(?:\b(?P<before>{'|'.join(NUMERIC_WORDS)})\s+)?"
+    r"(?P<op>more than|greater than|less than|fewer than|younger than|older than|"
+    r"at least|at most|over|above|under|below|>=|<=|>|<|=)?\s*"
+    r"\b(?P<num>\d+)\b"
+    rf"(?:\s+(?!(?:{OPERATOR_WORDS})\b)(?P<after>[a-z]+)\b(?(before)(?!\s+\d)))?"
+)
+
+def superlative_metric(q: str, df: pd.DataFrame):
+    """Leaderboard metric requested by a superlative query, or None"""
+    if "top scorer" in q or "top scorers" in q or "most goals" in q or "highest goals" in q:
+        if "Gls" in df.columns:
+            return "Gls"
+    if "most assists" in q or "top assist" in q:
+        if "Ast" in df.columns:
+            return "Ast"
+    if "highest value" in q or "most valuable" in q or "highest market value" in q:
+        if "Value" in df.columns:
+            return "Value"
+        elif "Gls" in df.columns or "Ast" in df.columns:
+            return "score"
+    return None
+
+def _column_for_word(word):
+    """Column named by a query word ('goals' -> 'Gls'), or None"""
+    if not word:
+        return None
+    return COLUMN_MAPPING.get(word) or COLUMN_MAPPING.get(word.rstrip("s"))
+
+class Compare:
+    """Numeric comparison on one column, e.g. Gls > 3"""
+
+    OPS = {
+        ">": np.greater,
+        "<": np.less,
+        ">=": np.greater_equal,
+        "<=": np.less_equal,
+        "==": np.equal,
+    }
+
+    def __init__(self, col, op, value):
+        self.col = col
+        self.op = op
+        self.value = value
+
+    def mask(self, df):
+        series = df[self.col]
+        if not pd.api.types.is_numeric_dtype(series):
+            series = pd.to_numeric(series, errors='coerce')
+        values = series.astype(float).to_numpy()
+        # NaN compares False, so missing values never match
+        return self.OPS[self.op](values, self.value)
+
+    def __repr__(self):
+        return f"{self.col} {self.op} {self.value}"
+
+class PositionMatch:
+    """Rows whose Pos field (e.g. 'DF,MF') includes a position code"""
+
+    def __init__(self, code):
+        self.code = code
+
+    def mask(self, df):
+        return CategoricalIndex.for_dataframe(df).get('Pos').mask([fold_text(self.code)])
+
+    def __repr__(self):
+        return f"Pos has {self.code}"
+
+class CategoryMatch:
+    """Rows whose text column equals one of several (folded) values"""
+
+    def __init__(self, col, keys):
+        self.col = col
+        self.keys = sorted(set(keys))
+
+    def mask(self, df):
+        return CategoricalIndex.for_dataframe(df).get(self.col).mask(self.keys)
+
+    def __repr__(self):
+        return f"{self.col} in {self.keys}"
+
+class QueryPlan:
+    """AND of predicates, optionally ranked by a leaderboard metric"""
+
+    def __init__(self, predicates=None, order_by=None, limit=None):
+        self.predicates = predicates or []
+        self.order_by = order_by
+        self.limit = limit
+
+    @property
+    def interpreted(self):
+        """True if any part of the query was understood"""
+        return bool(self.predicates) or self.order_by is not None
+
+    def execute_positions(self, df: pd.DataFrame, limit=None) -> np.ndarray:
+        """Evaluate the plan and return the matching row positions"""
+        # an explicit "top N" in the query caps the caller's limit
+        if self.limit is not None:
+            limit = self.limit if limit is None else min(limit, self.limit)
+        mask = np.ones(len(df), dtype=bool)
+        for predicate in self.predicates:
+            mask &= predicate.mask(df)
+
+        if self.order_by is not None:
+            order = Leaderboard.for_dataframe(df).top(self.order_by, len(df))
+            positions = order[mask[order]]
+        else:
+            positions = np.flatnonzero(mask)
+        if limit is not None:
+            positions = positions[:limit]
+        return positions
+
+    def execute(self, df: pd.DataFrame, limit=None) -> pd.DataFrame:
+        """Evaluate the plan and return the matching rows (possibly empty)"""
+        return df.iloc[self.execute_positions(df, limit)]
+
+    def __repr__(self):
+        return f"QueryPlan({self.predicates!r}, order_by={self.order_by!r}, limit={self.limit!r})"
+
+def compile_query(query: str, df: pd.DataFrame) -> QueryPlan:
+    """
+    Parse a free-text query once into a QueryPlan.
+
+    Understands superlatives ('top scorer', 'top 5 scorers'), numeric
+    comparisons bound to a column word ('more than 3 goals', 'age under 25',
+    bare 'under 25' means age), position words ('defender') and
+    Squad/League/Nation names ('barcelona', 'premier league').
+    """
+    q = normalize_text(query)
+    plan = QueryPlan()
+
+    # ranking: "top N" and superlatives
+    top_n = TOP_N_RE.search(q)
+    if top_n:
+        plan.limit = int(top_n.group(1))
+        q = TOP_N_RE.sub("top", q)
+    plan.order_by = superlative_metric(q, df)
+    if plan.order_by is not None:
+        q = re.sub(r"\b(top scorers?|most goals|highest goals|most assists|top assists?|"
+                   r"highest market value|highest value|most valuable)\b", " ", q)
+
+    # numeric comparisons
+    def bind(match):
+        before, after = match.group("before") or "", match.group("after") or ""
+        op_text = match.group("op") or ""
+        col = _column_for_word(after)
+        if col in NUMERIC_COLUMNS:
+            after = ""
+        else:
+            col = _column_for_word(before)
+            if col in NUMERIC_COLUMNS:
+                before = ""
+            elif op_text in AGE_WORDS:
+                col = "Age"
+        if col not in NUMERIC_COLUMNS or col not in df.columns:
+            return match.group(0)
+        op, value = parse_comparison(f"{op_text} {match.group('num')}")
+        plan.predicates.append(Compare(col, op, value))
+        # keep the surrounding words that weren't part of the comparison
+        return f" {before} {after} "
+    q = CLAUSE_RE.sub(bind, q)
+
+    tokens = q.split()
+
+    # position words
+    if 'Pos' in df.columns:
+        remaining = []
+        for token in tokens:
+            code = POSITION_SYNONYMS.get(token) or POSITION_SYNONYMS.get(token.rstrip("s"))
+            if code:
+                plan.predicates.append(PositionMatch(code))
+            else:
+                remaining.append(token)
+        tokens = remaining
+
+    # Squad / League / Nation names (longest word n-grams first, then single words)
+    categorical = CategoricalIndex.for_dataframe(df)
+    columns = [col for col in CATEGORY_COLUMNS if categorical.get(col) is not None]
+    matched = {}
+    used = [False] * len(tokens)
+    phrase_col = [None] * len(tokens)  # column of the multi-word name covering each token
+    for n in (3, 2, 1):
+        for i in range(len(tokens) - n + 1):
+            if any(used[i:i + n]):
+                continue
+            phrase = " ".join(tokens[i:i + n])
+            for col in columns:
+                key = categorical.get(col).lookup(phrase)
+                if key is not None:
+                    matched.setdefault(col, []).append(key)
+                    used[i:i + n] = [True] * n
+                    if n > 1:
+                        phrase_col[i:i + n] = [col] * n
+                    break
+    # misspelt or abbreviated names ('manchester united' -> 'manchester utd')
+    for n in (3, 2):
+        for i in range(len(tokens) - n + 1):
+            if any(used[i:i + n]) or any(t in STOPWORDS for t in tokens[i:i + n]):
+                continue
+            phrase = " ".join(tokens[i:i + n])
+            for col in columns:
+                key = categorical.get(col).fuzzy(phrase, cutoff=PHRASE_FUZZY_CUTOFF)
+                if key is not None:
+                    matched.setdefault(col, []).append(key)
+                    used[i:i + n] = [True] * n
+                    phrase_col[i:i + n] = [col] * n
+                    break
+    # single words; adjacent words hitting the same column narrow each other down
+    previous = None  # (token position, column, keys) of the last matched word
+    for i, token in enumerate(tokens):
+        if used[i] or token in STOPWORDS or len(token) < 4:
+            continue
+        for col in columns:
+            keys = set(categorical.get(col).keys_with_word(token))
+            if keys:
+                if col in phrase_col[max(0, i - 1):i + 2]:
+                    # part of a name matched next to it ('west ham united')
+                    used[i] = True
+                    break
+                if previous is not None and previous[:2] == (i - 1, col) and keys & previous[2]:
+                    group = matched[col]
+                    narrowed = keys & previous[2]
+                    # replace the previous word's keys with the ones containing both words
+                    del group[len(group) - len(previous[2]):]
+                    group.extend(sorted(narrowed))
+                    keys = narrowed
+                else:
+                    matched.setdefault(col, []).extend(sorted(keys))
+                previous = (i, col, keys)
+                used[i] = True
+                break
+    for col, keys in matched.items():
+        plan.predicates.append(CategoryMatch(col, keys))
+
+    # nothing else understood: fuzzy match the whole query against distinct values
+    if not plan.interpreted:
+        text = " ".join(tokens)
+        for col in ['Squad', 'Nation', 'Pos']:
+            index = categorical.get(col)
+            if index is None or not text:
+                continue
+            key = index.fuzzy(text, cutoff=0.7)
+            if key is not None:
+                plan.predicates.append(
+                    PositionMatch(index.original[key]) if col == 'Pos' else CategoryMatch(col, [key])
+                )
+                break
+
+    return plan
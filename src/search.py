@@ -1,168 +1,145 @@
 # src/search.py
-import difflib
-import re
+import numpy as np
 import pandas as pd
 
-from .utils import (
-    normalize_text,
-    COLUMN_MAPPING,
-    POSITION_SYNONYMS,
-    extract_integers,
-    parse_comparison
-)
+from .utils import normalize_text, fold_text
+from .search_index import PlayerNameIndex, CategoricalIndex
+from .query_planner import compile_query
+from .cache import LRUCache
+from .data_loader import on_reload, data_version
 
-def _fuzzy_choice(query, choices, cutoff=0.6):
+# (normalized query, limit, data version, frame identity) -> matching row positions
+SEARCH_CACHE = LRUCache(maxsize=512)
+on_reload(lambda df: SEARCH_CACHE.clear())
+
+def search_cache_info():
+    """Hit/miss counters of the search result cache"""
+    return SEARCH_CACHE.info()
+
+def _match_player_position(df: pd.DataFrame, query: str, threshold=0.75):
     """
-    Return best fuzzy match from choices using difflib SequenceMatcher ratio.
-    Returns (best_match, score) where score is 0..1
+    Try to match by player name (exact or fuzzy).
+    Returns the row position or None.
     """
-    if not choices:
-        return None, 0.0
-    query = normalize_text(query)
-    best = None
-    best_score = 0.0
-    for choice in choices:
-        if choice is None:
-            continue
-        score = difflib.SequenceMatcher(None, query, normalize_text(str(choice))).ratio()
-        if score > best_score:
-            best = choice
-            best_score = score
-    return best, best_score
+    if 'Player' not in df.columns:
+        return None
+
+    index = PlayerNameIndex.for_dataframe(df)
+
+    # exact case-insensitive match
+    pos = index.lookup(query)
+    if pos is not None:
+        return pos
+
+    # a single word naming one player (e.g. a surname), unless it names a club, league or nation
+    pos = index.lookup_token(query)
+    if pos is not None and not _names_category(df, query):
+        return pos
+
+    # fuzzy match among trigram-shortlisted player names
+    pos, _ = index.fuzzy(query, threshold)
+    return pos
+
+def _names_category(df: pd.DataFrame, word: str):
+    """True if word is, or is a word of, a Squad/League/Nation value"""
+    categorical = CategoricalIndex.for_dataframe(df)
+    for col in ('Squad', 'League', 'Nation'):
+        index = categorical.get(col)
+        if index is not None and (index.lookup(word) is not None or index.keys_with_word(word)):
+            return True
+    return False
 
 def _match_player_by_name(df: pd.DataFrame, query: str, threshold=0.75):
     """
     Try to match by player name (exact or fuzzy).
     Returns a single Series (row) or None.
     """
-    if 'Player' not in df.columns:
-        return None
+    pos = _match_player_position(df, query, threshold)
+    return None if pos is None else df.iloc[pos]
 
-    query_n = normalize_text(query)
-    # exact case-insensitive match
-    mask = df['Player'].astype(str).str.lower() == query_n
-    if mask.any():
-        return df[mask].iloc[0]
-
-    # fuzzy match among player names
-    names = df['Player'].astype(str).tolist()
-    best, score = _fuzzy_choice(query_n, names)
-    if best and score >= threshold:
-        return df[df['Player'].astype(str).str.lower() == normalize_text(best)].iloc[0]
-    return None
-
-def _column_contains(df: pd.DataFrame, col: str, word: str):
-    """Case-insensitive contains search on a column"""
-    if col not in df.columns:
-        return pd.DataFrame()
-    return df[df[col].astype(str).str.lower().str.contains(word.lower(), na=False)]
+def _contains_scan(df: pd.DataFrame, q: str):
+    """Last resort: positions of rows where the first matching column contains the query text"""
+    for col in df.columns:
+        try:
+            if col == 'Player':
+                # names are matched folded, so 'mbappe' finds 'Mbappé'
+                folded = fold_text(q)
+                names = PlayerNameIndex.for_dataframe(df).names
+                mask = np.fromiter((folded in name for name in names), dtype=bool, count=len(names))
+            else:
+                mask = df[col].astype(str).str.lower().str.contains(q, na=False, regex=False).to_numpy()
+            if mask.any():
+                return np.flatnonzero(mask)
+        except Exception:
+            continue
+    return np.empty(0, dtype=np.intp)
 
-def smart_search(query: str, df: pd.DataFrame):
+def search_players(query: str, df: pd.DataFrame, limit=None):
     """
-    Smart search that accepts any English input and returns a single player row (pandas Series),
-    or None if nothing matched.
+    Search returning every matching row as a DataFrame (possibly empty).
     Rules implemented (in priority order):
-      1. Try fuzzy player name match.
-      2. Handle ranked requests: 'top scorer', 'most assists', 'highest value'.
-      3. Keyword -> column mapping (e.g., 'goals', 'assists', 'age', 'team').
-         It supports numeric comparisons like 'more than 10 goals', 'age < 25'.
-      4. Position synonyms: 'goalkeeper', 'defender', 'midfielder', 'forward'.
-      5. Fuzzy match squad/team, nation, position when query looks like a name.
+      1. Exact or fuzzy player name match (single row).
+      2. Structured query compiled once by query_planner: superlatives
+         ('top 5 scorers'), numeric comparisons ('more than 10 goals',
+         'age < 25'), positions ('defender') and Squad/League/Nation names,
+         combined as boolean masks ('Barcelona defender under 25').
+      3. Only if nothing in the query could be interpreted: every player
+         with the single query word in their name ('mbappe'), else any
+         column contains the query text (player names compared folded).
     """
     if query is None:
-        return None
+        return df.iloc[0:0]
     q = normalize_text(query)
 
+    # repeated queries on the same data are served from the LRU cache
+    version = data_version(df)
+    key = (q, limit, version, id(df), len(df))
+    positions = SEARCH_CACHE.get(key) if version is not None else None
+    if positions is None:
+        positions = _search_positions(q, df, limit)
+        if version is not None:
+            SEARCH_CACHE.put(key, positions)
+    return df.iloc[positions]
+
+def _search_positions(q: str, df: pd.DataFrame, limit=None):
+    """Row positions matched by a normalized query (see search_players)"""
     # 1) direct player name fuzzy match
-    row = _match_player_by_name(df, q, threshold=0.7)
-    if row is not None:
-        return row
-
-    # 2) ranked requests and superlatives
-    if "top scorer" in q or "top scorers" in q or "most goals" in q or "highest goals" in q:
-        if "Gls" in df.columns:
-            sorted_df = df.copy()
-            sorted_df['__g'] = pd.to_numeric(sorted_df.get('Gls', 0), errors='coerce').fillna(0)
-            sorted_df = sorted_df.sort_values('__g', ascending=False)
-            return sorted_df.iloc[0]
-    if "most assists" in q or "top assist" in q:
-        if "Ast" in df.columns:
-            sorted_df = df.copy()
-            sorted_df['__a'] = pd.to_numeric(sorted_df.get('Ast', 0), errors='coerce').fillna(0)
-            sorted_df = sorted_df.sort_values('__a', ascending=False)
-            return sorted_df.iloc[0]
-    if "highest value" in q or "most valuable" in q or "highest market value" in q:
-        if "Value" in df.columns:
-            sorted_df = df.copy()
-            sorted_df['__v'] = pd.to_numeric(sorted_df.get('Value', 0), errors='coerce').fillna(0)
-            sorted_df = sorted_df.sort_values('__v', ascending=False)
-            return sorted_df.iloc[0]
-        elif "Gls" in df.columns or "Ast" in df.columns:
-            sorted_df = df.copy()
-            g = pd.to_numeric(sorted_df.get('Gls', 0), errors='coerce').fillna(0)
-            a = pd.to_numeric(sorted_df.get('Ast', 0), errors='coerce').fillna(0)
-            sorted_df['__score'] = g + 0.8 * a
-            sorted_df = sorted_df.sort_values('__score', ascending=False)
-            return sorted_df.iloc[0]
-
-    # 3) column keyword + numeric comparison parsing
-    for word, col in COLUMN_MAPPING.items():
-        if word in q:
-            op, val = parse_comparison(q)
-            if op is None:
-                nums = extract_integers(q)
-                if nums:
-                    op = "=="
-                    val = nums[0]
-            if val is not None and col in df.columns:
-                try:
-                    series = pd.to_numeric(df[col], errors='coerce')
-                    if op == ">":
-                        filtered = df[series > val]
-                    elif op == "<":
-                        filtered = df[series < val]
-                    elif op == ">=":
-                        filtered = df[series >= val]
-                    elif op == "<=":
-                        filtered = df[series <= val]
-                    elif op == "==":
-                        filtered = df[series == val]
-                    else:
-                        filtered = _column_contains(df, col, q)
-                except Exception:
-                    filtered = _column_contains(df, col, q)
-
-                if not filtered.empty:
-                    return filtered.iloc[0]
-
-            # non-numeric search
-            if col in df.columns:
-                filtered = _column_contains(df, col, word)
-                if not filtered.empty:
-                    return filtered.iloc[0]
-
-    # 4) position synonyms
-    for pos_word, pos_code in POSITION_SYNONYMS.items():
-        if pos_word in q and 'Pos' in df.columns:
-            filtered = df[df['Pos'].astype(str).str.upper() == pos_code]
-            if not filtered.empty:
-                return filtered.iloc[0]
-
-    # 5) fuzzy search on other text columns (Squad, Nation, Pos)
-    for col in ['Squad', 'Nation', 'Pos']:
-        if col in df.columns:
-            values = df[col].astype(str).tolist()
-            best, score = _fuzzy_choice(q, values)
-            if best and score >= 0.7:
-                return df[df[col].astype(str).str.lower() == normalize_text(best)].iloc[0]
-
-    # 6) final fallback: any column contains
-    for col in df.columns:
-        try:
-            filtered = df[df[col].astype(str).str.lower().str.contains(q, na=False)]
-            if not filtered.empty:
-                return filtered.iloc[0]
-        except Exception:
-            continue
+    pos = _match_player_position(df, q, threshold=0.7)
+    if pos is not None:
+        return np.array([pos])
+
+    # 2) structured query
+    plan = compile_query(q, df)
+    if plan.interpreted:
+        return plan.execute_positions(df, limit)
+
+    # 3) a word several players' names share (e.g. 'mbappe'), unless it names a club, league or nation
+    if 'Player' in df.columns and not _names_category(df, q):
+        positions = PlayerNameIndex.for_dataframe(df).token_positions(q)
+        if len(positions):
+            return positions if limit is None else positions[:limit]
+
+    # 4) final fallback: any column contains
+    positions = _contains_scan(df, q)
+    return positions if limit is None else positions[:limit]
+
+def suggest_players(query: str, df: pd.DataFrame, k=8, previous=None):
+    """
+    Search-as-you-type: up to k player rows whose names complete the partly
+    typed query, as a DataFrame. Returns (matches, state); pass state back
+    as previous on the next keystroke to narrow the previous candidates.
+    """
+    if not query or 'Player' not in df.columns:
+        return df.iloc[0:0], None
+    positions, state = PlayerNameIndex.for_dataframe(df).suggest(query, k, previous)
+    return df.iloc[positions], state
 
-    return None
+def smart_search(query: str, df: pd.DataFrame):
+    """
+    Smart search that accepts any English input and returns a single player row (pandas Series),
+    or None if nothing matched. See search_players for the rules.
+    """
+    matches = search_players(query, df, limit=1)
+    if matches.empty:
+        return None
+    return matches.iloc[0]
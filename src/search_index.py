@@ -0,0 +1,346 @@
+# src/search_index.py
+"""
+Precomputed search indexes over a loaded player DataFrame.
+Indexes are built once per DataFrame object and reused by every query;
+reloading the data produces a new DataFrame and therefore fresh indexes.
+"""
+import bisect
+import difflib
+import weakref
+from collections import defaultdict
+
+import numpy as np
+import pandas as pd
+
+from .utils import fold_text, name_key
+
+# id(df) -> {index name: index}; entries are dropped when the DataFrame is collected
+_INDEX_CACHE = {}
+
+def _cached_for(df: pd.DataFrame, key: str, builder):
+    """Return the index `key` for df, building it on first use"""
+    df_id = id(df)
+    entry = _INDEX_CACHE.get(df_id)
+    if entry is None:
+        entry = {}
+        _INDEX_CACHE[df_id] = entry
+        weakref.finalize(df, _INDEX_CACHE.pop, df_id, None)
+    index = entry.get(key)
+    # per-row indexes record the frame length they were built for
+    if index is None or getattr(index, "size", len(df)) != len(df):
+        index = builder(df)
+        entry[key] = index
+    return index
+
+def _trigrams(text: str):
+    """Character trigrams of a space-padded string"""
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+class PlayerNameIndex:
+    """
+    Name lookup structure for the 'Player' column.
+
+    Names are folded once (accents stripped, transliterated, lowercased).
+    Holds hash maps for exact lookups on the folded name, on its
+    token-sorted key and on unique name tokens (e.g. a surname), plus a
+    character trigram inverted index used to shortlist candidates before
+    scoring them with difflib.
+    """
+
+    def __init__(self, names, shortlist_size=32):
+        self.names = [fold_text(str(n)) if n is not None else "" for n in names]
+        self.size = len(self.names)
+        self.shortlist_size = shortlist_size
+
+        # exact lookups: key -> first row position
+        self.exact = {}
+        self.sorted_keys = {}
+        token_rows = defaultdict(set)
+        postings = defaultdict(list)
+        for pos, name in enumerate(self.names):
+            tokens = name.split()
+            self.exact.setdefault(name, pos)
+            self.sorted_keys.setdefault(name_key(name), pos)
+            for token in tokens:
+                token_rows[token].add(pos)
+            for gram in _trigrams(name):
+                postings[gram].append(pos)
+        # single-token lookups only for tokens that identify one player
+        self.unique_tokens = {
+            token: next(iter(rows)) for token, rows in token_rows.items() if len(rows) == 1
+        }
+        self.postings = {gram: np.asarray(rows, dtype=np.int32) for gram, rows in postings.items()}
+
+        # prefix lookups for search-as-you-type: sorted distinct tokens with their
+        # rows laid out contiguously, so every token starting with a prefix is one slice
+        self.tokens = sorted(token_rows)
+        sizes = [len(token_rows[token]) for token in self.tokens]
+        self.token_offsets = np.concatenate(([0], np.cumsum(sizes, dtype=np.int64)))
+        self.token_rows = np.fromiter(
+            (pos for token in self.tokens for pos in sorted(token_rows[token])),
+            dtype=np.int32, count=int(self.token_offsets[-1])
+        )
+        # alphabetical rank of every name (ties broken by row order), used to order suggestions
+        self.name_order = np.asarray(sorted(range(self.size), key=self.names.__getitem__), dtype=np.int32)
+        self.name_rank = np.empty(self.size, dtype=np.int32)
+        self.name_rank[self.name_order] = np.arange(self.size, dtype=np.int32)
+        self.sorted_names = [self.names[pos] for pos in self.name_order]
+
+    @classmethod
+    def for_dataframe(cls, df: pd.DataFrame):
+        """Index for df's 'Player' column, built once per DataFrame"""
+        return _cached_for(df, "player_names", lambda d: cls(d['Player'].tolist()))
+
+    def lookup(self, query: str):
+        """Row position of an exact (folded) or token-sorted name match, or None"""
+        pos = self.exact.get(fold_text(query))
+        if pos is not None:
+            return pos
+        return self.sorted_keys.get(name_key(query))
+
+    def lookup_token(self, query: str):
+        """Row position of the one player whose name has the single-word query as a token, or None"""
+        tokens = fold_text(query).split()
+        return self.unique_tokens.get(tokens[0]) if len(tokens) == 1 else None
+
+    def token_positions(self, query: str):
+        """Sorted row positions of every player whose name has the single-word query as a token"""
+        tokens = fold_text(query).split()
+        if len(tokens) != 1:
+            return np.empty(0, dtype=np.int32)
+        i = bisect.bisect_left(self.tokens, tokens[0])
+        if i == len(self.tokens) or self.tokens[i] != tokens[0]:
+            return np.empty(0, dtype=np.int32)
+        return self.token_rows[self.token_offsets[i]:self.token_offsets[i + 1]]
+
+    def candidates(self, query: str):
+        """Row positions sharing the most trigrams with query (best first)"""
+        query = fold_text(query)
+        grams = [self.postings[g] for g in _trigrams(query) if g in self.postings]
+        if not grams:
+            return np.empty(0, dtype=np.int32)
+        counts = np.bincount(np.concatenate(grams), minlength=self.size)
+        hits = np.flatnonzero(counts)
+        if len(hits) > self.shortlist_size:
+            top = np.argpartition(-counts[hits], self.shortlist_size - 1)[:self.shortlist_size]
+            hits = hits[top]
+        # Stable ordering: more shared trigrams first, then original row order
+        return hits[np.lexsort((hits, -counts[hits]))]
+
+    def fuzzy(self, query: str, threshold=0.75):
+        """
+        Best fuzzy name match among the trigram shortlist.
+        Returns (row position, score) or (None, best score) below threshold.
+        """
+        query = fold_text(query)
+        best = None
+        best_score = 0.0
+        matcher = difflib.SequenceMatcher(None, query, "")
+        for pos in sorted(self.candidates(query)):
+            matcher.set_seq2(self.names[pos])
+            # Cheap upper bounds first, like difflib.get_close_matches
+            if matcher.real_quick_ratio() <= best_score or matcher.quick_ratio() <= best_score:
+                continue
+            score = matcher.ratio()
+            if score > best_score:
+                best = pos
+                best_score = score
+        if best is not None and best_score >= threshold:
+            return best, best_score
+        return None, best_score
+
+    def _prefix_rows(self, prefix: str):
+        """Sorted row positions with a name token starting with prefix"""
+        lo = bisect.bisect_left(self.tokens, prefix)
+        hi = bisect.bisect_left(self.tokens, prefix + "\uffff")
+        if lo == hi:
+            return np.empty(0, dtype=np.int32)
+        rows = self.token_rows[self.token_offsets[lo]:self.token_offsets[hi]]
+        return np.unique(rows) if hi - lo > 1 else rows
+
+    def suggest(self, query: str, k=8, previous=None):
+        """
+        Top-k completions for a partially typed name.
+
+        Every query token must be a prefix of some token of the name; names
+        that start with the whole query come first, then alphabetical order.
+        Falls back to the trigram shortlist when nothing matches by prefix
+        (typos). Returns (row positions, state); pass state back as previous
+        on the next keystroke so a query that extends the previous one only
+        narrows the previous candidate set instead of starting over.
+        """
+        folded = fold_text(query)
+        tokens = folded.split()
+        if not tokens:
+            return np.empty(0, dtype=np.int32), None
+
+        candidates = None
+        start = 0
+        if previous is not None:
+            prev_query, prev_tokens, prev_candidates = previous
+            if folded.startswith(prev_query) and prev_tokens:
+                # earlier tokens are unchanged, only the last one (and new ones) narrow further
+                candidates = prev_candidates
+                start = len(prev_tokens) - 1
+        for token in tokens[start:]:
+            rows = self._prefix_rows(token)
+            if candidates is None:
+                candidates = rows
+            elif len(candidates):
+                candidates = candidates[np.isin(candidates, rows, assume_unique=True)]
+        state = (folded, tokens, candidates)
+
+        if not len(candidates):
+            return self.candidates(folded)[:k], state
+
+        # whole-name prefix matches are one contiguous run of the sorted names
+        lo = bisect.bisect_left(self.sorted_names, folded)
+        hi = bisect.bisect_left(self.sorted_names, folded + "\uffff")
+        head = self.name_order[lo:min(hi, lo + k)]
+        if len(head) >= k:
+            return head, state
+        rest = candidates[~np.isin(candidates, head)]
+        need = k - len(head)
+        if len(rest) > need:
+            rest = rest[np.argpartition(self.name_rank[rest], need - 1)[:need]]
+        rest = rest[np.argsort(self.name_rank[rest], kind="stable")]
+        return np.concatenate((head, rest)), state
+
+def _numeric_values(df: pd.DataFrame, col: str):
+    """Float array of a column with missing/non-numeric values as 0"""
+    if col not in df.columns:
+        return None
+    series = df[col]
+    if not pd.api.types.is_numeric_dtype(series):
+        series = pd.to_numeric(series, errors='coerce')
+    return series.astype(float).fillna(0).to_numpy()
+
+class Leaderboard:
+    """
+    Pre-sorted rank orders for superlative queries.
+
+    Keeps a descending, stable argsort of Gls, Ast, Value and the
+    goals + 0.8 * assists score, so "top N" never copies or re-sorts the
+    table (category filters are applied to the order as masks by the planner).
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        self.size = len(df)
+        self.orders = {}
+        goals = _numeric_values(df, 'Gls')
+        assists = _numeric_values(df, 'Ast')
+        for metric, values in (("Gls", goals), ("Ast", assists), ("Value", _numeric_values(df, 'Value'))):
+            if values is not None:
+                self.orders[metric] = np.argsort(-values, kind="stable")
+        if goals is not None or assists is not None:
+            score = (goals if goals is not None else 0) + 0.8 * (assists if assists is not None else 0)
+            self.orders["score"] = np.argsort(-np.asarray(score, dtype=float), kind="stable")
+
+    @classmethod
+    def for_dataframe(cls, df: pd.DataFrame):
+        """Leaderboards for df, built once per DataFrame"""
+        return _cached_for(df, "leaderboard", cls)
+
+    def top(self, metric: str, n=1):
+        """Row positions of the top n rows by metric"""
+        order = self.orders.get(metric)
+        if order is None:
+            return np.empty(0, dtype=np.intp)
+        return order[:n]
+
+class ColumnIndex:
+    """
+    Inverted index over one text column: distinct (folded) value -> row positions.
+
+    For multi-valued columns such as Pos ('DF,MF') every comma-separated
+    part is indexed on its own. Fuzzy matching runs over the distinct
+    values only, never over every row.
+    """
+
+    def __init__(self, series: pd.Series, multi_valued=False):
+        self.size = len(series)
+        codes, uniques = pd.factorize(series)
+        order = np.argsort(codes, kind="stable")
+        counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+        starts = np.searchsorted(codes[order], 0)
+        groups = np.split(order[starts:], np.cumsum(counts)[:-1]) if len(uniques) else []
+
+        rows = defaultdict(list)
+        self.original = {}
+        for value, positions in zip(uniques, groups):
+            parts = str(value).split(",") if multi_valued else [str(value)]
+            for part in parts:
+                key = fold_text(part)
+                if not key:
+                    continue
+                rows[key].append(positions)
+                self.original.setdefault(key, part.strip())
+        self.rows = {
+            key: np.sort(np.concatenate(chunks)) if len(chunks) > 1 else chunks[0]
+            for key, chunks in rows.items()
+        }
+
+        # word -> distinct values containing it ('manchester' -> manchester city, manchester utd)
+        self.words = defaultdict(set)
+        for key in self.rows:
+            for word in key.split():
+                self.words[word].add(key)
+
+    def keys(self):
+        return list(self.rows)
+
+    def lookup(self, value: str):
+        """Folded key of an exact (case/accent-insensitive) value match, or None"""
+        key = fold_text(str(value))
+        return key if key in self.rows else None
+
+    def keys_with_word(self, word: str):
+        """Folded keys of the distinct values that contain word"""
+        return sorted(self.words.get(fold_text(word), ()))
+
+    def fuzzy(self, query: str, cutoff=0.7):
+        """Best fuzzy match among the distinct values, or None"""
+        best = difflib.get_close_matches(fold_text(query), self.keys(), n=1, cutoff=cutoff)
+        return best[0] if best else None
+
+    def positions(self, keys):
+        """Sorted row positions having any of the given keys"""
+        chunks = [self.rows[k] for k in keys if k in self.rows]
+        if not chunks:
+            return np.empty(0, dtype=np.intp)
+        return np.unique(np.concatenate(chunks)) if len(chunks) > 1 else chunks[0]
+
+    def mask(self, keys):
+        """Boolean row mask for rows having any of the given keys"""
+        mask = np.zeros(self.size, dtype=bool)
+        mask[self.positions(keys)] = True
+        return mask
+
+class CategoricalIndex:
+    """ColumnIndex for each of Squad, League, Nation and Pos present in a DataFrame"""
+
+    COLUMNS = ("Squad", "League", "Nation", "Pos")
+    MULTI_VALUED = ("Pos",)
+
+    def __init__(self, df: pd.DataFrame):
+        self.size = len(df)
+        self.columns = {
+            col: ColumnIndex(df[col], multi_valued=col in self.MULTI_VALUED)
+            for col in self.COLUMNS if col in df.columns
+        }
+
+    @classmethod
+    def for_dataframe(cls, df: pd.DataFrame):
+        """Categorical indexes for df, built once per DataFrame"""
+        return _cached_for(df, "categorical", cls)
+
+    def get(self, col: str):
+        return self.columns.get(col)
+
+def build_indexes(df: pd.DataFrame):
+    """Build every search index for a freshly loaded DataFrame up front"""
+    if 'Player' in df.columns:
+        PlayerNameIndex.for_dataframe(df)
+    Leaderboard.for_dataframe(df)
+    CategoricalIndex.for_dataframe(df)
@@ -0,0 +1,231 @@
+# src/server.py
+"""
+Headless HTTP/JSON prediction service
+Loads the models and the player database once and keeps them resident,
+so other services can get predictions without the GUI.
+
+Endpoints:
+    GET  /health          -> readiness and cache counters
+    POST /predict         {"goals", "assists", "minutes", "age"} -> prediction
+    POST /predict/batch   {"players": [{"goals", ...}, ...]} -> list of predictions
+    POST /search          {"query", "limit"} -> matching players with predictions
+                          (and their previous season, when there is one)
+
+Concurrent /predict requests go through a PredictionCoalescer, which
+micro-batches them into single model calls.
+"""
+import asyncio
+import json
+import math
+import time
+
+import numpy as np
+import pandas as pd
+
+from .search import search_players, search_cache_info
+from . import predictor
+from .coalescer import PredictionCoalescer
+from .startup import prewarm
+from .history import PlayerHistory
+
+# Columns returned for each player by /search
+PLAYER_FIELDS = ["Player", "Season", "Squad", "League", "Nation", "Pos", "Age", "MP", "Min", "Gls", "Ast"]
+
+MAX_BODY_BYTES = 1 << 20
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+def _json_value(value):
+    """Convert NumPy/pandas scalars to plain JSON values (missing -> None)"""
+    if isinstance(value, np.generic):
+        value = value.item()
+    if value is None or value is pd.NA:
+        return None
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    return value
+
+def _features(payload):
+    """(goals, assists, minutes, age) from a request payload, with the GUI defaults"""
+    try:
+        return (
+            float(payload.get("goals", 0) or 0),
+            float(payload.get("assists", 0) or 0),
+            float(payload.get("minutes", 0) or 0),
+            float(payload.get("age", 25) or 25),
+        )
+    except (TypeError, ValueError, AttributeError):
+        raise HTTPError(400, "goals, assists, minutes and age must be numbers")
+
+def _limit(payload, default=10):
+    """Positive integer 'limit' from a request payload"""
+    try:
+        limit = int(payload.get("limit", default))
+    except (TypeError, ValueError):
+        raise HTTPError(400, "'limit' must be an integer")
+    if limit < 1:
+        raise HTTPError(400, "'limit' must be at least 1")
+    return limit
+
+class PredictionServer:
+    """asyncio HTTP/1.1 server around the resident models and player data"""
+
+    def __init__(self, host="127.0.0.1", port=8765):
+        self.host = host
+        self.port = port
+        self.players_df = None
+        self.prediction_table = None
+        self.startup = None
+        self.coalescer = PredictionCoalescer()
+        self.started = time.time()
+        self.routes = {
+            ("GET", "/health"): self.health,
+            ("POST", "/predict"): self.predict,
+            ("POST", "/predict/batch"): self.predict_batch,
+            ("POST", "/search"): self.search,
+        }
+
+    def load(self):
+        """Load models and player data once, in parallel (blocking)"""
+        self.startup = prewarm()
+        self.startup.ready.wait()
+        self.players_df = self.startup.players_df
+        self.prediction_table = self.startup.prediction_table
+        print(f"Startup {self.startup.summary()}")
+
+    async def health(self, payload):
+        return {
+            "status": "ok",
+            "models_loaded": predictor.MODELS_LOADED,
+            "players": 0 if self.players_df is None else len(self.players_df),
+            "uptime_s": round(time.time() - self.started, 1),
+            "startup_s": {k: round(v, 3) for k, v in self.startup.timings.items()} if self.startup else None,
+            "coalescer": self.coalescer.stats(),
+            "search_cache": search_cache_info(),
+        }
+
+    async def predict(self, payload):
+        return await asyncio.wrap_future(self.coalescer.submit(*_features(payload)))
+
+    async def predict_batch(self, payload):
+        players = payload.get("players")
+        if not isinstance(players, list):
+            raise HTTPError(400, "'players' must be a list")
+        frame = pd.DataFrame([_features(p) for p in players], columns=["Gls", "Ast", "Min", "Age"])
+        loop = asyncio.get_running_loop()
+        results = await loop.run_in_executor(None, predictor.predict_batch, frame)
+        return {"predictions": results.to_dict(orient="records")}
+
+    async def search(self, payload):
+        if self.players_df is None:
+            raise HTTPError(503, "player database not loaded")
+        query = payload.get("query")
+        if not query:
+            raise HTTPError(400, "'query' is required")
+        limit = _limit(payload)
+        loop = asyncio.get_running_loop()
+        matches = await loop.run_in_executor(None, search_players, query, self.players_df, limit)
+        if self.prediction_table is not None and not self.prediction_table.is_stale(self.players_df):
+            predictions = self.prediction_table.predictions.loc[matches.index]
+        else:
+            predictions = await loop.run_in_executor(None, predictor.predict_batch, matches)
+        fields = [f for f in PLAYER_FIELDS if f in matches.columns]
+        history = PlayerHistory.for_dataframe(self.players_df) if "PlayerID" in matches.columns else None
+        players = []
+        for (_, row), (_, pred) in zip(matches.iterrows(), predictions.iterrows()):
+            record = {f: _json_value(row[f]) for f in fields}
+            record["prediction"] = {k: _json_value(v) for k, v in pred.items()}
+            previous = history.previous_for_row(row) if history is not None else None
+            if previous is not None:
+                record["previous_season"] = {
+                    f: _json_value(previous[f]) for f in fields
+                }
+            players.append(record)
+        return {"query": query, "count": len(players), "players": players}
+
+    async def handle(self, reader, writer):
+        """Serve requests on one (keep-alive) connection"""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                try:
+                    method, path, _ = request_line.decode("latin-1").split(" ", 2)
+                except ValueError:
+                    await self._respond(writer, 400, {"error": "bad request line"}, keep_alive=False)
+                    break
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                keep_alive = headers.get("connection", "").lower() != "close"
+
+                status, body = await self._dispatch(method, path.split("?", 1)[0], headers, reader)
+                await self._respond(writer, status, body, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _dispatch(self, method, path, headers, reader):
+        try:
+            length = int(headers.get("content-length", 0))
+            if length > MAX_BODY_BYTES:
+                raise HTTPError(413, "request body too large")
+            payload = {}
+            if length:
+                raw = await reader.readexactly(length)
+                try:
+                    payload = json.loads(raw)
+                except ValueError:
+                    raise HTTPError(400, "body must be JSON")
+                if not isinstance(payload, dict):
+                    raise HTTPError(400, "body must be a JSON object")
+
+            handler = self.routes.get((method, path))
+            if handler is None:
+                raise HTTPError(404, f"no route for {method} {path}")
+            return 200, await handler(payload)
+        except HTTPError as e:
+            return e.status, {"error": e.message}
+        except Exception as e:
+            print(f"Error handling {method} {path}: {e}")
+            return 500, {"error": str(e)}
+
+    async def _respond(self, writer, status, body, keep_alive):
+        data = json.dumps(body, default=_json_value).encode("utf-8")
+        reason = {200: "OK", 400: "Bad Request", 404: "Not Found", 413: "Payload Too Large",
+                  500: "Internal Server Error", 503: "Service Unavailable"}.get(status, "")
+        head = (
+            f"HTTP/1.1 {status} {reason}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(data)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        )
+        writer.write(head.encode("latin-1") + data)
+        await writer.drain()
+
+    async def serve(self):
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self.load)
+        server = await asyncio.start_server(self.handle, self.host, self.port)
+        print(f"Prediction server listening on http://{self.host}:{self.port}")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            self.coalescer.close()
+
+def main(host="127.0.0.1", port=8765):
+    asyncio.run(PredictionServer(host, port).serve())
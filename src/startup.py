@@ -0,0 +1,90 @@
+# src/startup.py
+"""
+Background prewarming of everything the first prediction needs
+Model loading and player data loading run in parallel threads; the
+prediction table (which needs both) is built once they finish. Each phase
+is timed so startup and time-to-first-prediction can be tracked.
+
+Heavy modules (pandas, the predictor) are imported inside the phases, so
+importing this module is cheap.
+"""
+import threading
+import time
+
+class StartupReport:
+    """Readiness flag, loaded objects and per-phase timings (seconds)"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.timings = {}
+        self.errors = {}
+        self.players_df = None
+        self.prediction_table = None
+        self.ready = threading.Event()
+        self._lock = threading.Lock()
+
+    def record(self, phase, seconds):
+        with self._lock:
+            self.timings[phase] = seconds
+
+    def mark(self, phase):
+        """Record the time from startup to now under phase (e.g. 'first_prediction')"""
+        with self._lock:
+            if phase not in self.timings:
+                self.timings[phase] = time.perf_counter() - self.started
+
+    def summary(self):
+        """One line like 'ready in 0.41s (models 0.02s, data 0.17s, ...)'"""
+        with self._lock:
+            parts = ", ".join(f"{phase} {seconds:.2f}s" for phase, seconds in self.timings.items()
+                              if phase != "ready")
+            total = self.timings.get("ready")
+        head = f"ready in {total:.2f}s" if total is not None else "loading"
+        return f"{head} ({parts})" if parts else head
+
+def _timed(report, phase, func):
+    start = time.perf_counter()
+    try:
+        return func()
+    except Exception as e:
+        report.errors[phase] = e
+        print(f"Error during startup phase '{phase}': {e}")
+        return None
+    finally:
+        report.record(phase, time.perf_counter() - start)
+
+def _load_models():
+    from . import predictor
+    predictor._ensure_models_loaded()
+
+def _load_data():
+    from .data_loader import load_and_combine
+    return load_and_combine()
+
+def _run(report, on_ready):
+    models = threading.Thread(target=_timed, args=(report, "models", _load_models), daemon=True)
+    models.start()
+    report.players_df = _timed(report, "data", _load_data)
+    models.join()
+
+    # Precomputed predictions for every player (rebuilt if data or models changed)
+    if report.players_df is not None:
+        from .prediction_table import load_prediction_table
+        report.prediction_table = _timed(
+            report, "prediction_table", lambda: load_prediction_table(report.players_df)
+        )
+
+    report.mark("ready")
+    report.ready.set()
+    if on_ready is not None:
+        on_ready(report)
+
+def prewarm(on_ready=None, report=None):
+    """
+    Start loading models, player data and the prediction table in the
+    background. Returns the StartupReport immediately; on_ready(report) is
+    called from the loader thread once everything is done.
+    """
+    report = report or StartupReport()
+    threading.Thread(target=_run, args=(report, on_ready), daemon=True).start()
+    return report
@@ -0,0 +1,205 @@
+# src/synthetic.py
+"""
+Synthetic player-season data with the exact data/Season.csv schema
+Rows are generated chunk by chunk from the shipped Season.csv as a template:
+every generated season copies the stat profile of a real player with the
+same primary position (so per-position distributions and the correlations
+between columns are kept), scaled by a per-season form factor with
+per-cell noise. Players get multi-season careers under one PlayerID,
+names are recombined from the real (accented) first and last names, and
+a share of cells is left empty. Chunks are streamed to CSV, or to Parquet
+when pyarrow is installed, so 10M-row files never have to fit in memory.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+ve_dir = os.path.dirname(script_dir)
+TEMPLATE_CSV = os.path.join(ve_dir, "data", "Season.csv")
+
+# Columns that identify a row and are never left empty
+ID_COLUMNS = ["PlayerID", "Player", "Season", "Pos"]
+
+# Text columns copied from the template (everything else is numeric)
+TEXT_COLUMNS = ["Player", "Squad", "League", "Nation", "Pos", "Season"]
+
+# Longest generated career, and the chance a player changes club between seasons
+MAX_SEASONS = 8
+TRANSFER_RATE = 0.2
+
+class SeasonTemplate:
+    """Column layout and per-position stat profiles taken from a real Season.csv"""
+
+    def __init__(self, csv_path=TEMPLATE_CSV):
+        df = pd.read_csv(csv_path)
+        self.columns = list(df.columns)
+        self.stat_columns = [c for c in self.columns if c not in TEXT_COLUMNS and c not in ("PlayerID", "Age", "Born")]
+        stats = df[self.stat_columns].apply(pd.to_numeric, errors="coerce")
+        self.stats = stats.to_numpy(dtype=float)
+        present = ~np.isnan(self.stats)
+        self.integral = np.array([
+            bool(np.all(np.mod(col[mask], 1) == 0)) for col, mask in zip(self.stats.T, present.T)
+        ])
+        self.signed = np.nanmin(self.stats, axis=0) < 0
+        self.percent = np.array(["%" in c for c in self.stat_columns])
+        self.spread = np.nan_to_num(np.nanstd(self.stats, axis=0))
+
+        self.squads = df["Squad"].astype(str).to_numpy()
+        self.leagues = df["League"].astype(str).to_numpy()
+        self.nations = df["Nation"].astype(str).to_numpy()
+        self.positions = df["Pos"].astype(str).to_numpy()
+        self.born = pd.to_numeric(df["Born"], errors="coerce").fillna(1998).to_numpy(dtype=int)
+        self.latest_season = int(str(df["Season"].astype(str).max())[:4])
+        self.max_player_id = int(pd.to_numeric(df["PlayerID"], errors="coerce").max())
+        ages = pd.to_numeric(df["Age"], errors="coerce").dropna()
+        self.min_age, self.max_age = int(ages.min()), int(ages.max())
+
+        # rows grouped by primary position (GK/DF/MF/FW), for per-position sampling
+        primary = np.array([p.split(",")[0] for p in self.positions])
+        self.groups, group_of_row = np.unique(primary, return_inverse=True)
+        self.group_of_row = group_of_row
+        self.group_order = np.argsort(group_of_row, kind="stable")
+        sizes = np.bincount(group_of_row, minlength=len(self.groups))
+        self.group_start = np.r_[0, np.cumsum(sizes)[:-1]]
+        self.group_size = sizes
+
+        names = df["Player"].astype(str).str.split(n=1)
+        self.first_names = np.unique([parts[0] for parts in names if len(parts) == 2])
+        self.last_names = np.unique([parts[1] for parts in names if len(parts) == 2])
+
+    def sample_in_group(self, groups, rng):
+        """A random template row with the given position group, per entry of groups"""
+        offsets = (rng.random(len(groups)) * self.group_size[groups]).astype(int)
+        return self.group_order[self.group_start[groups] + offsets]
+
+def iter_synthetic_seasons(n_rows, seed=0, chunk_size=50_000, missing_rate=0.01, template=None, first_id=None):
+    """
+    Yield DataFrames (at most chunk_size rows each, n_rows in total) with the
+    exact Season.csv columns.
+
+    Args:
+        n_rows: total number of player-season rows
+        seed: random seed (the same seed gives the same data)
+        chunk_size: rows per yielded chunk
+        missing_rate: share of stat/club cells left empty
+        template: SeasonTemplate to sample from (built from data/Season.csv by default)
+        first_id: PlayerID of the first generated player; by default just above
+            the template's largest PlayerID, so generated players never share
+            an ID with the real ones still read from All_Players.csv
+    """
+    template = template or SeasonTemplate()
+    rng = np.random.default_rng(seed)
+    next_id = template.max_player_id + 1 if first_id is None else first_id
+    produced = 0
+    while produced < n_rows:
+        wanted = min(chunk_size, n_rows - produced)
+
+        # players and their careers (consecutive seasons ending with the latest one)
+        n_players = max(1, wanted // 2)
+        careers = np.minimum(rng.geometric(0.35, n_players), MAX_SEASONS)
+        keep = np.searchsorted(np.cumsum(careers), wanted) + 1
+        careers = careers[:keep]
+        careers[-1] -= max(0, careers.sum() - wanted)
+        n_players = len(careers)
+        player = np.repeat(np.arange(n_players), careers)
+        starts = np.r_[0, np.cumsum(careers)[:-1]]
+        season_index = np.arange(len(player)) - starts[player]
+        years_back = careers[player] - 1 - season_index
+        year = template.latest_season - years_back
+
+        # per-player identity: template row, name, birth year
+        home = rng.integers(0, len(template.positions), n_players)
+        first = template.first_names[rng.integers(0, len(template.first_names), n_players)]
+        last = template.last_names[rng.integers(0, len(template.last_names), n_players)]
+        names = np.char.add(np.char.add(first.astype(str), " "), last.astype(str))
+        # birth year jittered, then bounded so every season's age is within the template's range
+        born = template.born[home] + rng.integers(-3, 4, n_players)
+        born = np.clip(
+            born,
+            template.latest_season - template.max_age,
+            template.latest_season - (careers - 1) - template.min_age
+        )
+
+        # club: the home club, moving to another template club on transfers
+        club_row = home[player].copy()
+        transfers = (season_index > 0) & (rng.random(len(player)) < TRANSFER_RATE)
+        club_row[transfers] = rng.integers(0, len(template.squads), int(transfers.sum()))
+        # a transfer carries over to the player's later seasons
+        moved = np.where(transfers, np.arange(len(player)), starts[player])
+        club_row = club_row[np.maximum.accumulate(moved)]
+
+        # stats: a same-position template season, scaled by form and noise
+        stats_row = template.sample_in_group(template.group_of_row[home[player]], rng)
+        stats = template.stats[stats_row]
+        form = rng.lognormal(0.0, 0.2, (len(player), 1))
+        noise = rng.lognormal(0.0, 0.05, stats.shape)
+        scaled = stats * form * noise
+        shifted = stats + rng.normal(0.0, 0.1, stats.shape) * template.spread
+        stats = np.where(template.signed, shifted, scaled)
+        stats = np.where(template.percent, np.clip(stats, 0, 100), stats)
+        stats = np.where(template.integral, np.round(stats), np.round(stats, 2))
+
+        chunk = {
+            "PlayerID": next_id + player,
+            "Player": names[player],
+            "Squad": template.squads[club_row].astype(object),
+            "League": template.leagues[club_row].astype(object),
+            "Nation": template.nations[home[player]].astype(object),
+            "Pos": template.positions[home[player]],
+            "Age": year - born[player],
+            "Born": born[player],
+            "Season": np.char.add(np.char.add(year.astype(str), "-"), (year + 1).astype(str)),
+        }
+        for i, col in enumerate(template.stat_columns):
+            chunk[col] = stats[:, i]
+        frame = pd.DataFrame(chunk)[template.columns]
+
+        # missing values outside the identifying columns
+        if missing_rate > 0:
+            for col in template.columns:
+                if col in ID_COLUMNS:
+                    continue
+                mask = rng.random(len(frame)) < missing_rate
+                if mask.any():
+                    if col in ("Age", "Born"):
+                        frame[col] = frame[col].astype("Int64")
+                    frame.loc[mask, col] = None
+
+        next_id += n_players
+        produced += len(frame)
+        yield frame
+
+def write_csv(path, n_rows, **kwargs):
+    """Stream n_rows synthetic rows to a CSV file; returns the number of rows written"""
+    written = 0
+    for i, chunk in enumerate(iter_synthetic_seasons(n_rows, **kwargs)):
+        chunk.to_csv(path, mode="w" if i == 0 else "a", header=i == 0, index=False)
+        written += len(chunk)
+    return written
+
+def write_parquet(path, n_rows, **kwargs):
+    """Stream n_rows synthetic rows to a Parquet file (needs pyarrow); returns the rows written"""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ImportError("Parquet output needs pyarrow (pip install pyarrow); use CSV output instead")
+
+    written = 0
+    writer = None
+    schema = None
+    try:
+        for chunk in iter_synthetic_seasons(n_rows, **kwargs):
+            if schema is None:
+                # fix the schema from the first chunk; later chunks are cast to it
+                schema = pa.Schema.from_pandas(chunk.astype({"Age": "Int64", "Born": "Int64"}), preserve_index=False)
+                writer = pq.ParquetWriter(path, schema)
+            table = pa.Table.from_pandas(chunk.astype({"Age": "Int64", "Born": "Int64"}), schema=schema, preserve_index=False)
+            writer.write_table(table)
+            written += len(chunk)
+    finally:
+        if writer is not None:
+            writer.close()
+    return written
@@ -0,0 +1,95 @@
+# src/task_manager.py
+"""
+Bounded background task manager for the GUI
+Runs work on a small thread pool instead of one thread per click. Tasks are
+grouped by channel (e.g. the results frame): submitting a new task supersedes
+the previous one on the same channel, so queued work is cancelled, running
+work can stop early, and only the latest task may update the UI.
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+class Task:
+    """Handle passed to a running task: staleness checks and UI delivery"""
+
+    def __init__(self, manager, channel, generation):
+        self._manager = manager
+        self.channel = channel
+        self.generation = generation
+        self.future = None
+
+    def is_current(self):
+        """False once a newer task was submitted on the same channel"""
+        return self._manager._is_current(self.channel, self.generation)
+
+    def ui(self, callback, *args):
+        """
+        Run callback(*args) on the UI thread, but only if this task is still
+        the latest on its channel when the callback actually runs.
+        """
+        if not self.is_current():
+            return
+        def deliver():
+            if self.is_current():
+                callback(*args)
+        self._manager._dispatch(deliver)
+
+class TaskManager:
+    """
+    Executor-backed task runner with at most max_workers threads.
+
+    dispatch(fn) must schedule fn on the UI thread (for Tk: lambda fn: app.after(0, fn)).
+    """
+
+    def __init__(self, dispatch, max_workers=2):
+        self._dispatch = dispatch
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="gui-task")
+        self._generations = {}
+        self._latest = {}
+        self._lock = threading.Lock()
+
+    def _is_current(self, channel, generation):
+        with self._lock:
+            return self._generations.get(channel) == generation
+
+    def submit(self, channel, func, *args):
+        """
+        Run func(task, *args) in the pool, superseding the previous task on channel.
+        Returns the new Task.
+        """
+        with self._lock:
+            generation = self._generations.get(channel, 0) + 1
+            self._generations[channel] = generation
+            previous = self._latest.get(channel)
+            task = Task(self, channel, generation)
+            self._latest[channel] = task
+        # a superseded task that hasn't started yet never runs
+        if previous is not None and previous.future is not None:
+            previous.future.cancel()
+        task.future = self._executor.submit(self._run, task, func, args)
+        return task
+
+    def _run(self, task, func, args):
+        if not task.is_current():
+            return None
+        try:
+            return func(task, *args)
+        except Exception as e:
+            print(f"Error in background task ({task.channel}): {e}")
+            return None
+
+    def cancel(self, channel):
+        """Supersede whatever is queued or running on channel"""
+        with self._lock:
+            self._generations[channel] = self._generations.get(channel, 0) + 1
+            previous = self._latest.pop(channel, None)
+        if previous is not None and previous.future is not None:
+            previous.future.cancel()
+
+    def shutdown(self):
+        """Cancel queued tasks and stop the pool without waiting for running ones"""
+        with self._lock:
+            for channel in self._generations:
+                self._generations[channel] += 1
+            self._latest.clear()
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -1,5 +1,7 @@
 # src/utils.py
 import re
+import unicodedata
+import pandas as pd
 
 # Mapping common English words to CSV column names
 COLUMN_MAPPING = {
@@ -47,6 +49,47 @@ def normalize_text(s: str) -> str:
     s = re.sub(r'\s+', ' ', s)
     return s
 
+# Letters that don't decompose into base letter + accent under Unicode NFKD
+TRANSLITERATIONS = str.maketrans({
+    "æ": "ae",
+    "œ": "oe",
+    "ø": "o",
+    "đ": "d",
+    "ð": "d",
+    "þ": "th",
+    "ł": "l",
+    "ı": "i",
+    "’": "",
+    "'": "",
+    "`": "",
+    "-": " ",
+    ".": " "
+})
+
+# Accent/transliteration-insensitive form used for name matching ("Edin Džeko" -> "edin dzeko")
+def fold_text(s: str) -> str:
+    if s is None:
+        return ""
+    s = unicodedata.normalize("NFKD", s)
+    s = "".join(c for c in s if not unicodedata.combining(c))
+    s = s.casefold().translate(TRANSLITERATIONS)
+    return " ".join(s.split())
+
+# Word-order-insensitive key ("Dzeko Edin" and "Edin Džeko" -> "dzeko edin")
+def name_key(s: str) -> str:
+    return " ".join(sorted(fold_text(s).split()))
+
+# Missing-value check for typed player rows (None, '', NaN or <NA>)
+def is_missing(value) -> bool:
+    if value is None:
+        return True
+    if isinstance(value, str):
+        return value.strip() == ''
+    try:
+        return bool(pd.isna(value))
+    except (TypeError, ValueError):
+        return False
+
 # Extract all integers from text (e.g., "more than 10 goals" -> [10])
 def extract_integers(s: str):
     return [int(n) for n in re.findall(r'\d+', s)]
@@ -55,14 +98,7 @@ def extract_integers(s: str):
 def parse_comparison(s: str):
     s = s.lower()
     # patterns: "> 10", ">=10", "more than 10", "less than 5", "under 25", "over 1000"
-    if "more than" in s or "over" in s or "greater than" in s or ">" in s:
-        nums = extract_integers(s)
-        if nums:
-            return ">", nums[0]
-    if "less than" in s or "under" in s or "<" in s:
-        nums = extract_integers(s)
-        if nums:
-            return "<", nums[0]
+    # (inclusive forms first, since ">=" also contains ">")
     if "at least" in s or ">=" in s:
         nums = extract_integers(s)
         if nums:
@@ -71,6 +107,14 @@ def parse_comparison(s: str):
         nums = extract_integers(s)
         if nums:
             return "<=", nums[0]
+    if "more than" in s or "over" in s or "greater than" in s or "older than" in s or "above" in s or ">" in s:
+        nums = extract_integers(s)
+        if nums:
+            return ">", nums[0]
+    if "less than" in s or "under" in s or "fewer than" in s or "younger than" in s or "below" in s or "<" in s:
+        nums = extract_integers(s)
+        if nums:
+            return "<", nums[0]
     # direct equality like "age 22" or "5 goals"
     nums = extract_integers(s)
     if nums:
@@ -0,0 +1,8 @@
+import os
+import sys
+
+# Same layout the scripts use: the repo root (for `src.X`) and src itself
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for path in (ROOT, os.path.join(ROOT, "src")):
+    if path not in sys.path:
+        sys.path.insert(0, path)
@@ -0,0 +1,149 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src import model_trainer, player_store
+from src.model_trainer import (
+    prepare_data, load_training_rows, engineer_features, safe_convert, start_background_training
+)
+
+def reference_prepare(df):
+    """The original row-by-row loop prepare_data replaced"""
+    features, perf, value = [], [], []
+    for _, row in df.iterrows():
+        goals = safe_convert(row.get('Gls', 0))
+        assists = safe_convert(row.get('Ast', 0))
+        minutes = safe_convert(row.get('MP', 0))
+        age = safe_convert(row.get('Age', 25))
+        if goals < 0 or assists < 0 or minutes < 0 or age < 16 or age > 50:
+            continue
+        min_played = safe_convert(row.get('Min', minutes * 90))
+        features.append([goals, assists, min_played, age])
+
+        base_performance = goals + assists * 0.8
+        if 23 <= age <= 28:
+            age_multiplier = 1.1
+        elif age < 23:
+            age_multiplier = 0.95 + (age - 18) * 0.03
+        else:
+            age_multiplier = 1.0 - (age - 28) * 0.02
+        if min_played > 2000:
+            time_factor = 1.0
+        elif min_played > 1000:
+            time_factor = 0.9
+        else:
+            time_factor = 0.7
+        perf.append(max(0, base_performance * age_multiplier * time_factor * 0.15))
+
+        base_value = (goals * 2.5) + (assists * 1.8)
+        if age < 23:
+            age_value_factor = 1.3
+        elif age <= 28:
+            age_value_factor = 1.0
+        else:
+            age_value_factor = 0.6 - (age - 28) * 0.05
+        consistency_factor = min(1.0, min_played / 2500)
+        value.append(max(0.1, (base_value * age_value_factor * consistency_factor) / 10))
+    return np.array(features), np.array(perf), np.array(value)
+
+def test_prepare_data_matches_row_loop():
+    df = pd.concat([pd.read_csv(path) for path in model_trainer._source_csvs()], ignore_index=True)
+    for got, expected in zip(prepare_data(), reference_prepare(df)):
+        np.testing.assert_array_equal(got, expected)
+
+def test_engineer_features_edge_rows():
+    df = pd.DataFrame({
+        "Gls": [3, -1, "x", 10, None, 4],
+        "Ast": [1, 0, 2, 4, 1, 0],
+        "MP": [10, 5, 3, 30, 12, 20],
+        "Age": [17, 25, 30, 51, 16, 28],
+        "Min": [800, 400, None, 2700, 1500, 2100],
+    })
+    for got, expected in zip(engineer_features(df), reference_prepare(df)):
+        np.testing.assert_array_equal(got, expected)
+
+def test_training_rows_keep_repeated_keys(tmp_path, monkeypatch):
+    frame = pd.DataFrame({
+        "PlayerID": [1, 1, 2], "Season": ["2024-2025"] * 3,
+        "Gls": [3, 5, 1], "Ast": [1, 2, 0], "MP": [10, 12, 8], "Age": [24, 24, 30], "Min": [900, 1000, 700],
+    })
+    paths = [tmp_path / "a.csv", tmp_path / "b.csv"]
+    frame.to_csv(paths[0], index=False)
+    frame.iloc[:1].to_csv(paths[1], index=False)
+    monkeypatch.setattr(player_store, "STORE_DIR", str(tmp_path / ".store"))
+    monkeypatch.setattr(model_trainer, "_source_csvs", lambda: [str(p) for p in paths])
+
+    assert len(load_training_rows()) == 4
+    assert len(load_training_rows(unique=True)) == 2
+    keys = model_trainer._row_keys(load_training_rows())
+    assert len(set(keys)) == len(keys)
+
+def test_failed_background_training_is_retried_after_backoff(monkeypatch):
+    calls = []
+    def failing():
+        calls.append(1)
+        raise RuntimeError("no data")
+    monkeypatch.setattr(model_trainer, "_migrate_legacy_pickles", lambda: False)
+    monkeypatch.setattr(model_trainer, "train_models", failing)
+    monkeypatch.setattr(model_trainer, "_BACKGROUND_TRAINING", None)
+    monkeypatch.setattr(model_trainer, "_BACKGROUND_FAILURES", 0)
+    monkeypatch.setattr(model_trainer, "_RETRY_AFTER", 0.0)
+
+    start_background_training().join()
+    # within the backoff every call gets the failed run back instead of retraining
+    start_background_training().join()
+    assert len(calls) == 1
+
+    monkeypatch.setattr(model_trainer, "_RETRY_AFTER", 0.0)
+    start_background_training().join()
+    assert len(calls) == 2
+    assert model_trainer._BACKGROUND_FAILURES == 2
+
+def test_bundle_rejects_mismatched_scaler(tmp_path):
+    joblib = pytest.importorskip("joblib")
+    from sklearn.ensemble import RandomForestRegressor
+    from sklearn.preprocessing import StandardScaler
+    from src.model_trainer import save_model_bundle, load_model_bundle
+
+    rng = np.random.default_rng(0)
+    X, y = rng.random((60, 4)) * [30, 20, 3000, 20], rng.random(60)
+    scaler = StandardScaler().fit(X)
+    model = RandomForestRegressor(n_estimators=3, random_state=0).fit(scaler.transform(X), y)
+    path = str(tmp_path / "bundle.joblib")
+    save_model_bundle(model, model, scaler, "hash", path=path)
+    assert load_model_bundle(path) is not None
+
+    bundle = joblib.load(path)
+    other = StandardScaler().fit(X * 2)
+    bundle["forests"]["value"]["scaler_fingerprint"] = \
+        model_trainer.export_forest(model, other)["scaler_fingerprint"]
+    joblib.dump(bundle, path)
+    with pytest.raises(ValueError):
+        load_model_bundle(path)
+
+def test_converted_legacy_pickles_record_no_training_hash(tmp_path, monkeypatch):
+    pytest.importorskip("joblib")
+    import functools
+    import pickle
+    from sklearn.ensemble import RandomForestRegressor
+    from sklearn.preprocessing import StandardScaler
+
+    rng = np.random.default_rng(0)
+    X, y = rng.random((60, 4)) * [30, 20, 3000, 20], rng.random(60)
+    scaler = StandardScaler().fit(X)
+    model = RandomForestRegressor(n_estimators=3, random_state=0).fit(scaler.transform(X), y)
+    for name, obj in (("perf", model), ("value", model), ("scaler", scaler)):
+        with open(tmp_path / model_trainer.LEGACY_PICKLES[name], "wb") as f:
+            pickle.dump(obj, f)
+
+    path = str(tmp_path / "bundle.joblib")
+    monkeypatch.setattr(model_trainer, "MODELS_DIR", str(tmp_path))
+    monkeypatch.setattr(model_trainer, "save_model_bundle",
+                        functools.partial(model_trainer.save_model_bundle, path=path))
+    # the pickles' training data is unknown; today's CSVs must not be hashed in its place
+    monkeypatch.setattr(model_trainer, "prepare_data", lambda: pytest.fail("prepare_data called"))
+
+    assert model_trainer._migrate_legacy_pickles()
+    manifest, _ = model_trainer.load_model_bundle(path)
+    assert manifest["training_data_hash"] is None
+    assert manifest["n_samples"] is None
@@ -0,0 +1,47 @@
+import pandas as pd
+import pytest
+
+from src import prediction_table
+
+
+@pytest.fixture
+def versioned(monkeypatch, tmp_path):
+    """Stub the input version and keep the table file out of the store"""
+    version = {"value": "v1"}
+    monkeypatch.setattr(prediction_table, "TABLE_PATH", str(tmp_path / "predictions.npz"))
+    monkeypatch.setattr(prediction_table, "STALE_CHECK_INTERVAL", 0.0)
+    monkeypatch.setattr(prediction_table, "current_version", lambda: version["value"])
+    return version
+
+
+def _players(n, goals=5):
+    return pd.DataFrame({
+        "Gls": [goals] * n, "Ast": [2] * n, "Min": [1800] * n, "Age": [25] * n,
+    }, index=pd.RangeIndex(100, 100 + n))
+
+
+def test_stale_table_rebuilds_in_background(versioned):
+    df = _players(3)
+    table = prediction_table.build_prediction_table(df)
+    assert not table.is_stale(df)
+
+    versioned["value"] = "v2"
+    assert table.is_stale(df)
+    table._refreshing.join(timeout=30)
+
+    assert table.version == "v2"
+    assert not table.is_stale(df)
+
+
+def test_reload_retargets_live_tables(versioned):
+    old = _players(3)
+    table = prediction_table.load_prediction_table(old)
+    new = _players(5, goals=20)
+
+    prediction_table._on_data_reload(new)
+    assert table.is_stale(old)
+    table._refreshing.join(timeout=30)
+
+    assert not table.is_stale(new)
+    assert list(table.predictions.index) == list(new.index)
+    assert table.lookup(104) is not None
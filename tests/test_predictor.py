@@ -0,0 +1,32 @@
+import numpy as np
+import pytest
+
+from src.model_trainer import export_forest
+from src.predictor import CompiledForest
+
+sklearn = pytest.importorskip("sklearn")
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.preprocessing import StandardScaler
+
+def player_features(rng, n):
+    """(goals, assists, minutes, age) rows like the training data, plus fractional minutes"""
+    return np.column_stack([
+        rng.integers(0, 35, n), rng.integers(0, 20, n),
+        rng.integers(0, 3400, n) + rng.choice([0.0, 0.5], n), rng.integers(16, 40, n)
+    ]).astype(float)
+
+@pytest.mark.parametrize("params", [
+    {"n_estimators": 20, "max_depth": 10},
+    {"n_estimators": 7, "max_depth": None, "min_samples_leaf": 3},
+])
+def test_compiled_forest_matches_sklearn(params):
+    rng = np.random.default_rng(0)
+    X = player_features(rng, 800)
+    y = X[:, 0] + 0.8 * X[:, 1] + rng.normal(0, 1, len(X))
+    scaler = StandardScaler().fit(X)
+    model = RandomForestRegressor(**params, random_state=0).fit(scaler.transform(X), y)
+    forest = CompiledForest(export_forest(model, scaler))
+
+    # unseen rows, the training rows themselves (values on split points), more rows than one chunk
+    for rows in (player_features(rng, 1), player_features(rng, 2 * CompiledForest.CHUNK_ROWS + 3), X):
+        np.testing.assert_allclose(forest.predict(rows), model.predict(scaler.transform(rows)), rtol=0, atol=1e-9)
@@ -0,0 +1,80 @@
+import pandas as pd
+import pytest
+
+from src.query_planner import compile_query, Compare, PositionMatch
+
+@pytest.fixture
+def players():
+    return pd.DataFrame({
+        "Player": ["Ana Gomez", "Ben Diaz", "Carl Ruiz", "Dan Silva", "Eli Costa"],
+        "Squad": ["Barcelona", "Milan", "Milan", "Arsenal", "Barcelona"],
+        "League": ["La Liga", "Serie A", "Serie A", "Premier League", "La Liga"],
+        "Nation": ["ESP", "ITA", "ITA", "ENG", "POR"],
+        "Pos": ["FW", "MF", "FW", "DF", "FW,MF"],
+        "Age": [19, 31, 24, 20, 35],
+        "Gls": [12, 2, 5, 0, 15],
+        "Ast": [3, 7, 1, 0, 6],
+        "MP": [30, 28, 20, 10, 33],
+    })
+
+def comparisons(plan):
+    return sorted((p.col, p.op, p.value) for p in plan.predicates if isinstance(p, Compare))
+
+@pytest.mark.parametrize("query, expected", [
+    ("over 10 goals", [("Gls", ">", 10)]),
+    ("above 5 assists", [("Ast", ">", 5)]),
+    ("under 5 goals", [("Gls", "<", 5)]),
+    ("below 20 age", [("Age", "<", 20)]),
+    ("more than 10 goals", [("Gls", ">", 10)]),
+    ("at least 5 goals", [("Gls", ">=", 5)]),
+    ("goals over 10", [("Gls", ">", 10)]),
+    ("age under 25", [("Age", "<", 25)]),
+    ("over 30", [("Age", ">", 30)]),
+    ("under 20", [("Age", "<", 20)]),
+    # a second clause's operator or column word is not taken by the first one
+    ("under 25 more than 3 goals", [("Age", "<", 25), ("Gls", ">", 3)]),
+    ("defender under 25 over 3 goals", [("Age", "<", 25), ("Gls", ">", 3)]),
+    ("under 25 at least 3 goals", [("Age", "<", 25), ("Gls", ">=", 3)]),
+    ("goals 5 assists 3", [("Ast", "==", 3), ("Gls", "==", 5)]),
+    ("5 goals 3 assists", [("Ast", "==", 3), ("Gls", "==", 5)]),
+])
+def test_leading_operator_is_kept(players, query, expected):
+    assert comparisons(compile_query(query, players)) == expected
+
+def test_bare_age_with_position(players):
+    plan = compile_query("under 21 forwards", players)
+    assert comparisons(plan) == [("Age", "<", 21)]
+    assert any(isinstance(p, PositionMatch) for p in plan.predicates)
+    assert list(plan.execute(players)["Player"]) == ["Ana Gomez"]
+
+def test_over_goals_rows(players):
+    assert list(compile_query("over 10 goals", players).execute(players)["Player"]) == ["Ana Gomez", "Eli Costa"]
+
+def test_top_n_caps_caller_limit(players):
+    plan = compile_query("top 2 scorers", players)
+    assert list(plan.execute(players, limit=10)["Player"]) == ["Eli Costa", "Ana Gomez"]
+    assert len(plan.execute(players, limit=1)) == 1
+
+@pytest.fixture
+def clubs():
+    squads = ["Manchester Utd", "Manchester City", "Leeds United", "West Ham", "Real Madrid"]
+    return pd.DataFrame({
+        "Player": [f"Player {i}" for i in range(len(squads))],
+        "Squad": squads,
+        "League": ["Premier League"] * 4 + ["La Liga"],
+        "Nation": ["ENG"] * len(squads),
+        "Pos": ["FW"] * len(squads),
+        "Age": [25] * len(squads),
+        "Gls": [1] * len(squads),
+        "Ast": [1] * len(squads),
+    })
+
+@pytest.mark.parametrize("query, squads", [
+    ("manchester united", ["Manchester Utd"]),
+    ("west ham united", ["West Ham"]),
+    ("manchester", ["Manchester Utd", "Manchester City"]),
+    ("manchester city", ["Manchester City"]),
+    ("real madrid", ["Real Madrid"]),
+])
+def test_club_names_are_not_widened_word_by_word(clubs, query, squads):
+    assert list(compile_query(query, clubs).execute(clubs)["Squad"]) == squads
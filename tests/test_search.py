@@ -0,0 +1,46 @@
+import pandas as pd
+import pytest
+
+from src.search import search_players
+
+@pytest.fixture
+def players():
+    return pd.DataFrame({
+        "Player": ["Milan Đurić", "Edin Džeko", "Rafael Leão", "Yangel Herrera", "Theo Hernández", "Ven Kolar"],
+        "Squad": ["Parma", "Fiorentina", "Milan", "Girona", "Milan", "Ajax"],
+        "League": ["Serie A", "Serie A", "Serie A", "La Liga", "Serie A", "Eredivisie"],
+        "Nation": ["BIH", "BIH", "POR", "VEN", "FRA", "NED"],
+        "Pos": ["FW", "FW", "FW", "MF", "DF", "GK"],
+        "Age": [35, 39, 26, 27, 27, 22],
+        "Gls": [5, 6, 9, 2, 3, 0],
+        "Ast": [1, 2, 6, 3, 4, 0],
+    })
+
+def names(rows):
+    return list(rows["Player"])
+
+def test_club_name_wins_over_unique_first_name(players):
+    assert names(search_players("milan", players)) == ["Rafael Leão", "Theo Hernández"]
+
+def test_nation_code_wins_over_name_token(players):
+    assert names(search_players("ven", players)) == ["Yangel Herrera"]
+
+@pytest.mark.parametrize("query", ["dzeko", "Džeko", "dzeko edin", "EDIN DZEKO"])
+def test_unique_surname_and_folded_names(players, query):
+    assert names(search_players(query, players)) == ["Edin Džeko"]
+
+@pytest.fixture
+def brothers(players):
+    extra = pd.DataFrame({
+        "Player": ["Kylian Mbappé", "Ethan Mbappé"], "Squad": ["Real Madrid", "Lille"],
+        "League": ["La Liga", "Ligue 1"], "Nation": ["FRA", "FRA"], "Pos": ["FW", "MF"],
+        "Age": [26, 18], "Gls": [31, 1], "Ast": [3, 2],
+    })
+    return pd.concat([players, extra], ignore_index=True)
+
+@pytest.mark.parametrize("query", ["mbappe", "Mbappé"])
+def test_shared_surname_returns_every_player(brothers, query):
+    assert names(search_players(query, brothers)) == ["Kylian Mbappé", "Ethan Mbappé"]
+
+def test_contains_scan_folds_player_names(brothers):
+    assert names(search_players("bappe", brothers)) == ["Kylian Mbappé", "Ethan Mbappé"]
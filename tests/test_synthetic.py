@@ -0,0 +1,57 @@
+import pandas as pd
+import pytest
+
+from src import player_store
+from src.data_loader import load_and_combine
+from src.synthetic import SeasonTemplate, TEMPLATE_CSV, iter_synthetic_seasons, write_csv
+
+@pytest.fixture(scope="module")
+def template():
+    return SeasonTemplate()
+
+@pytest.fixture(scope="module")
+def rows(template):
+    return pd.concat(iter_synthetic_seasons(20_000, seed=1, chunk_size=7_000, template=template), ignore_index=True)
+
+def test_exact_schema(rows):
+    assert list(rows.columns) == list(pd.read_csv(TEMPLATE_CSV, nrows=0).columns)
+    assert len(rows) == 20_000
+
+def test_ages_within_template_range(rows, template):
+    ages = pd.to_numeric(rows["Age"]).dropna()
+    assert ages.min() >= template.min_age
+    assert ages.max() <= template.max_age
+
+def test_careers_are_consistent(rows):
+    assert not rows.duplicated(["PlayerID", "Season"]).any()
+    players = rows.groupby("PlayerID")
+    assert (players["Player"].nunique() == 1).all()
+    start = rows["Season"].str[:4].astype(int)
+    # no missing Born/Age cells in this check: the birth year is fixed per player
+    known = rows["Age"].notna() & rows["Born"].notna()
+    assert ((start - rows["Born"])[known] == rows["Age"][known]).all()
+
+def test_generated_csv_can_replace_season_csv(tmp_path, monkeypatch):
+    path = tmp_path / "synthetic_season.csv"
+    assert write_csv(path, 500, seed=2, chunk_size=200) == 500
+    monkeypatch.setenv(player_store.SEASON_CSV_ENV, str(path))
+    monkeypatch.setattr(player_store, "STORE_DIR", str(tmp_path / ".store"))
+    assert player_store.source_csvs()[1] == str(path)
+    assert len(player_store.read_table(player_store.source_csvs()[1])) == 500
+
+def test_generated_ids_never_collide_with_real_players(rows, template):
+    assert rows["PlayerID"].min() > template.max_player_id
+
+def test_load_and_combine_reads_generated_csv(tmp_path, monkeypatch):
+    path = tmp_path / "synthetic_season.csv"
+    write_csv(path, 12_000, seed=3, chunk_size=4_000)
+    generated = pd.read_csv(path)
+    real = pd.read_csv(player_store.source_csvs()[0])
+    monkeypatch.setenv(player_store.SEASON_CSV_ENV, str(path))
+    monkeypatch.setattr(player_store, "STORE_DIR", str(tmp_path / ".store"))
+
+    df = load_and_combine()
+    # every real player keeps their own row and every generated player gets one
+    assert len(df) == real["PlayerID"].nunique() + generated["PlayerID"].nunique()
+    real_rows = df[df["PlayerID"].isin(real["PlayerID"])]
+    assert set(real_rows["Season"].astype(str)) == set(real["Season"].astype(str))
@@ -9,7 +9,7 @@ import os
 # Add src to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
-from src.model_trainer import train_models
+from src.model_trainer import train_models, train_incremental
 
 if __name__ == "__main__":
     print("=" * 60)
@@ -17,8 +17,36 @@ if __name__ == "__main__":
     print("=" * 60)
     print()
     
+    # --incremental: only fit new/changed (PlayerID, Season) rows on top of the last run
+    # --select: cross-validate a hyperparameter grid first and train with the best params
+    # --select-next-season: cross-validate against real next-season goals/assists
+    #   (evaluation only; the served models and the bundle are left unchanged)
+    incremental = "--incremental" in sys.argv[1:]
+    select = "--select" in sys.argv[1:]
+    next_season = "--select-next-season" in sys.argv[1:]
+
     try:
-        train_models()
+        if next_season:
+            from src.model_selection import select_models
+            _, best = select_models(dataset="next_season")
+            print(f"Best parameters for next-season goals/assists: {best}")
+            sys.exit(0)
+        if incremental:
+            train_incremental()
+        elif select:
+            from src.model_selection import select_models
+            _, best = select_models()
+            print(f"Best parameters: {best}")
+            train_models(params=best)
+        else:
+            train_models()
+
+        # Score the whole player database with the new models
+        from src.data_loader import load_and_combine
+        from src.prediction_table import build_prediction_table
+        print("Precomputing predictions for all players...")
+        table = build_prediction_table(load_and_combine())
+        print(f"Stored predictions for {len(table.predictions)} players")
         print()
         print("=" * 60)
         print("✅ Model training completed successfully!")